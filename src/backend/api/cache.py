@@ -0,0 +1,163 @@
+"""Response cache module for memoizing RAG answers across requests."""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache for query responses keyed by normalized question."""
+
+    def __init__(self, ttl_seconds: int = 3600, max_size: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(question: str, top_k: int) -> str:
+        """Build a cache key that ignores case and surrounding whitespace."""
+        normalized = json.dumps({"q": question.strip().lower(), "k": top_k})
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def get(self, question: str, top_k: int) -> Optional[Dict]:
+        """Return the cached response, or None if missing or expired."""
+        key = self.make_key(question, top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["created"] >= self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry["response"]
+
+    def set(self, question: str, top_k: int, response: Dict) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        key = self.make_key(question, top_k)
+        with self._lock:
+            self._entries[key] = {"response": response, "created": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache's size and its hit and miss counts."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticResponseCache:
+    """Thread-safe TTL + LRU cache for query responses keyed by question embedding.
+
+    Catches rephrasings the exact-match ResponseCache misses: a question whose
+    embedding is at least ``similarity_threshold`` cosine-similar to a cached
+    one, asked with the same top_k, reuses that question's response.
+
+    Entries live in fixed slots of preallocated arrays, so a lookup scores every
+    cached question with one matrix-vector product instead of a Python loop.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl_seconds: int = 3600, max_size: int = 500):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        # One row per slot; allocated on the first set, once the embedding size is known
+        self._embeddings: Optional[np.ndarray] = None
+        self._top_k = np.zeros(max_size, dtype=np.int64)
+        self._created = np.zeros(max_size)
+        self._used = np.zeros(max_size, dtype=bool)
+        self._responses: List[Optional[Dict]] = [None] * max_size
+        # Occupied slots, least recently used first
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Scale an embedding to unit length, so dot products are cosine similarities."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def get(self, embedding: np.ndarray, top_k: int) -> Optional[Dict]:
+        """Return the response of the most similar cached question, or None below the threshold."""
+        query = self._normalize(embedding)
+        now = time.time()
+        with self._lock:
+            expired = np.flatnonzero(self._used & (now - self._created >= self.ttl_seconds))
+            for slot in expired:
+                self._release(int(slot))
+
+            best_slot = None
+            if self._lru:
+                similarities = self._embeddings @ query
+                similarities[~(self._used & (self._top_k == top_k))] = -np.inf
+                slot = int(np.argmax(similarities))
+                if similarities[slot] >= self.similarity_threshold:
+                    best_slot = slot
+
+            if best_slot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._lru.move_to_end(best_slot)
+            return self._responses[best_slot]
+
+    def set(self, embedding: np.ndarray, top_k: int, response: Dict) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.max_size, len(vector)), dtype=np.float32)
+            if len(self._lru) >= self.max_size:
+                self._release(next(iter(self._lru)))
+            # argmin over the occupancy flags finds the first free slot
+            slot = int(np.argmin(self._used))
+            self._embeddings[slot] = vector
+            self._top_k[slot] = top_k
+            self._created[slot] = time.time()
+            self._used[slot] = True
+            self._responses[slot] = response
+            self._lru[slot] = None
+
+    def _release(self, slot: int) -> None:
+        """Free a slot; callers hold the lock."""
+        self._used[slot] = False
+        self._responses[slot] = None
+        del self._lru[slot]
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the hit and miss counters."""
+        with self._lock:
+            self._used[:] = False
+            self._responses = [None] * self.max_size
+            self._lru.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache's size and its hit and miss counts."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._lru)
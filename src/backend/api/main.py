@@ -1,20 +1,38 @@
 """FastAPI application for Jason RAG API."""
-import asyncio
-import json
-from functools import lru_cache
-from typing import List, Dict
+from collections.abc import AsyncIterable
+from contextlib import asynccontextmanager
+from typing import List, Literal, Union
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.sse import EventSourceResponse, ServerSentEvent
+from pydantic import BaseModel, ConfigDict
 
+from api.cache import ResponseCache, SemanticResponseCache
 from config.database import VectorDatabase
-from config.config import OPENAI_API_KEY, LLM_MODEL, EMBEDDING_MODEL
+from config.config import (
+    OPENAI_API_KEY,
+    LLM_MODEL,
+    EMBEDDING_MODEL,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_SIZE,
+    SEMANTIC_CACHE_SIMILARITY,
+    SEMANTIC_CACHE_TTL_SECONDS,
+)
 from ingestion.embedder import Embedder
+from retrieval.batcher import QueryBatcher
 from retrieval.query import QueryEngine
 from retrieval.prompt import PromptBuilder
 
-app = FastAPI(title="Jason RAG API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Close the async Qdrant and OpenAI connections on shutdown."""
+    yield
+    await vector_db.aclose()
+    await prompt_builder.aclose()
+
+
+app = FastAPI(title="Jason RAG API", version="1.0.0", lifespan=lifespan)
 
 # Initialize components
 embedder = Embedder(model_name=EMBEDDING_MODEL)
@@ -22,27 +40,100 @@ vector_db = VectorDatabase()
 vector_db.connect()
 
 query_engine = QueryEngine(embedder, vector_db)
+query_batcher = QueryBatcher(query_engine)
 prompt_builder = PromptBuilder(openai_api_key=OPENAI_API_KEY, model=LLM_MODEL)
-
-
-@lru_cache(maxsize=128)
-def _cached_rag_query(question: str, top_k: int):
-    retrieved_docs = query_engine.search(question, top_k=top_k)
-    return prompt_builder.answer_question(question, retrieved_docs)
+response_cache = ResponseCache(
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS, max_size=RESPONSE_CACHE_MAX_SIZE
+)
+semantic_cache = SemanticResponseCache(
+    similarity_threshold=SEMANTIC_CACHE_SIMILARITY,
+    ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+    max_size=RESPONSE_CACHE_MAX_SIZE,
+)
+
+
+async def _cached_rag_query(question: str, top_k: int):
+    """
+    Answer a question, reusing a cached response for equivalent questions.
+
+    Exact repeats are served without embedding; rephrasings are matched by
+    embedding similarity before any retrieval or LLM call is made.
+    """
+    cached = response_cache.get(question, top_k)
+    if cached is not None:
+        return cached
+
+    # Cached by the query engine, so the search below reuses this embedding
+    query_embedding = await query_engine.aembed_query(question)
+    # Not copied into the exact tier: a fresh entry there would outlive the original answer's TTL
+    cached = semantic_cache.get(query_embedding, top_k)
+    if cached is not None:
+        return cached
+
+    retrieved_docs = await query_batcher.search(question, top_k=top_k)
+    response = await prompt_builder.aanswer_question(question, retrieved_docs)
+    response_cache.set(question, top_k, response)
+    semantic_cache.set(query_embedding, top_k, response)
+    return response
 
 
 class QueryRequest(BaseModel):
     """Request model for query endpoint."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     question: str
     top_k: int = 5
 
 
+class Source(BaseModel):
+    """A retrieved document chunk, as returned by VectorDatabase search."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: Union[str, int]
+    title: str
+    content: str
+    source: str
+    url: str
+    published_date: str
+    similarity: float
+
+
 class QueryResponse(BaseModel):
     """Response model for query endpoint."""
 
+    model_config = ConfigDict(frozen=True)
+
     answer: str
-    sources: List[Dict]
+    sources: List[Source]
+
+
+class SourcesEvent(BaseModel):
+    """Stream event carrying the retrieved sources."""
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["sources"] = "sources"
+    sources: List[Source]
+
+
+class TextEvent(BaseModel):
+    """Stream event carrying a chunk of the generated answer."""
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["text"] = "text"
+    content: str
+
+
+class ErrorEvent(BaseModel):
+    """Stream event reporting a failure during retrieval or answer generation."""
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["error"] = "error"
+    detail: str
 
 
 @app.get("/")
@@ -57,33 +148,41 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """Report the size and hit and miss counts of both response cache tiers."""
+    return {"exact": response_cache.stats(), "semantic": semantic_cache.stats()}
+
+
 @app.post("/query", response_model=QueryResponse)
 async def query(request: QueryRequest):
     """Answer a question using RAG."""
     try:
-        return await asyncio.to_thread(_cached_rag_query, request.question, request.top_k)
+        return await _cached_rag_query(request.question, request.top_k)
     except Exception as e:
         print(f"Error in query endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@app.post("/query/stream")
-async def query_stream(request: QueryRequest):
+@app.post("/query/stream", response_class=EventSourceResponse)
+async def query_stream(request: QueryRequest) -> AsyncIterable[ServerSentEvent]:
     """Answer a question using RAG with streaming LLM response."""
     try:
-        retrieved_docs = await asyncio.to_thread(
-            query_engine.search, request.question, request.top_k
-        )
+        retrieved_docs = await query_batcher.search(request.question, top_k=request.top_k)
         context = prompt_builder.build_context(retrieved_docs)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        print(f"Error in query stream endpoint: {e}")
+        yield ServerSentEvent(data=ErrorEvent(detail=str(e)))
+        return
 
-    def generate():
-        yield f"data: {json.dumps({'type': 'sources', 'sources': retrieved_docs})}\n\n"
-        for chunk in prompt_builder.generate_answer_stream(request.question, context):
-            yield f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n"
-
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    yield ServerSentEvent(data=SourcesEvent(sources=retrieved_docs))
+    try:
+        async for chunk in prompt_builder.agenerate_answer_stream(request.question, context):
+            yield ServerSentEvent(data=TextEvent(content=chunk))
+    except Exception as e:
+        # Tells the client the text it already received is not a complete answer
+        print(f"Error in query stream endpoint: {e}")
+        yield ServerSentEvent(data=ErrorEvent(detail=str(e)))
 
 
 if __name__ == "__main__":
@@ -10,15 +10,33 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # Qdrant Configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "jason_documents")
 
 # Scraping Configuration
 MEDIUM_USERNAME = os.getenv("MEDIUM_USERNAME")
 GITHUB_USERNAME = os.getenv("GITHUB_USERNAME")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# "pdfium" extracts text in C; "pdfplumber" keeps the slower layout-aware extractor
+RESUME_PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pdfium")
 
 # Model Configuration
-EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+# fastembed serves this model from the int8-quantized Qdrant/bge-small-en-v1.5-onnx-Q export
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
 LLM_MODEL = "gpt-4o-mini"
+# Comma-separated ONNX Runtime execution providers; unset lets fastembed use its default
+EMBEDDING_PROVIDERS = [
+    provider.strip() for provider in os.getenv("EMBEDDING_PROVIDERS", "").split(",") if provider.strip()
+] or None
+# Texts per ONNX Runtime call; larger batches fill the GEMM kernels better on many-core CPUs
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+# Response Cache Configuration
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "500"))
+# Minimum cosine similarity for a rephrased question to reuse a cached response
+SEMANTIC_CACHE_SIMILARITY = float(os.getenv("SEMANTIC_CACHE_SIMILARITY", "0.95"))
+# Entries are never invalidated by re-ingestion, so they expire with exact-match ones by default
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", str(RESPONSE_CACHE_TTL_SECONDS)))
 
 HF_TOKEN = os.getenv("HF_TOKEN")
@@ -1,85 +1,190 @@
 """Database module for vector database operations."""
+import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-from uuid import uuid4
+from uuid import NAMESPACE_URL, uuid5
 
 import numpy as np
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, VectorParams, PayloadSchemaType, OrderBy
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Datatype,
+    Distance,
+    HnswConfigDiff,
+    OrderBy,
+    PayloadSchemaType,
+    PointStruct,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 
-from config.config import QDRANT_COLLECTION_NAME, QDRANT_HOST, QDRANT_PORT
+from config.config import QDRANT_COLLECTION_NAME, QDRANT_GRPC_PORT, QDRANT_HOST, QDRANT_PORT
 from config.db_helper import check_payload_index_exists
 
+logger = logging.getLogger(__name__)
+
 
 class VectorDatabase:
     """Manages Qdrant vector database."""
 
-    def __init__(self, host: str = QDRANT_HOST, port: int = QDRANT_PORT):
+    UPLOAD_BATCH_SIZE = 256
+    SCRAPE_STATE_PAGE_SIZE = 256
+    HNSW_CONFIG = HnswConfigDiff(m=32, ef_construct=256)
+    # int8 vectors are kept in RAM for candidate scoring; the oversampled
+    # candidates are rescored against the original vectors to preserve recall.
+    QUANTIZATION_CONFIG = ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    )
+    # The original vectors are only read to rescore quantized candidates, so half
+    # precision halves their storage while moving scores by under 0.001
+    VECTOR_DATATYPE = Datatype.FLOAT16
+    # Search results only expose these fields, so chunk_index and content_hash are not fetched
+    SEARCH_PAYLOAD_FIELDS = ['title', 'content', 'source', 'url', 'published_date']
+    # Without hnsw_ef, Qdrant searches with ef_construct (256); queries ask for a handful
+    # of hits, so a narrower beam keeps recall while visiting far fewer graph nodes.
+    # Qdrant still widens the beam to the limit for larger top_k.
+    SEARCH_HNSW_EF = 64
+    SEARCH_PARAMS = SearchParams(
+        hnsw_ef=SEARCH_HNSW_EF,
+        quantization=QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0),
+    )
+
+    def __init__(
+        self, host: str = QDRANT_HOST, port: int = QDRANT_PORT, grpc_port: int = QDRANT_GRPC_PORT
+    ):
         self.host = host
         self.port = port
+        self.grpc_port = grpc_port
         self.collection_name = QDRANT_COLLECTION_NAME
+        self.state_collection_name = f"{QDRANT_COLLECTION_NAME}_scrape_state"
         self.client = None
+        self.aclient = None
+        self._collection_known_to_exist = False
+        self._indexed_fields = set()
 
     def connect(self):
-        """Establish connection to Qdrant."""
-        self.client = QdrantClient(host=self.host, port=self.port)
+        """Establish sync and async gRPC connections to Qdrant."""
+        client_kwargs = {
+            "host": self.host,
+            "port": self.port,
+            "grpc_port": self.grpc_port,
+            "prefer_grpc": True,
+        }
+        self.client = QdrantClient(**client_kwargs)
+        self.aclient = AsyncQdrantClient(**client_kwargs)
         print(f"Connected to Qdrant at {self.host}:{self.port}")
         return self.client
 
     def setup_database(self, embedding_dim: int = 384):
         """Initialize Qdrant collection."""
-        collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
-
-        if self.collection_name not in collection_names:
+        if not self._collection_exists():
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(
                     size=embedding_dim,
-                    distance=Distance.COSINE
-                )
+                    distance=Distance.COSINE,
+                    datatype=self.VECTOR_DATATYPE,
+                ),
+                hnsw_config=self.HNSW_CONFIG,
+                quantization_config=self.QUANTIZATION_CONFIG
             )
+            self._collection_known_to_exist = True
             print(f"Created collection: {self.collection_name}")
         else:
             print(f"Collection {self.collection_name} already exists")
 
-        if not check_payload_index_exists(self.client, self.collection_name, "source"):
-            self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="source",
-                field_schema=PayloadSchemaType.KEYWORD,
-            )
+        self._ensure_payload_index("source", PayloadSchemaType.KEYWORD)
 
-    def insert_documents(self, documents: List[Dict]):
-        """Insert documents with embeddings into Qdrant."""
-        points = [self._create_point_from_document(doc) for doc in documents]
-        self.client.upsert(
+    def insert_documents(self, documents: List[Dict], embeddings: Optional[np.ndarray] = None):
+        """
+        Insert documents with embeddings into Qdrant.
+
+        Embeddings are sent as one float32 matrix so the client can encode them
+        without converting every vector to a list of Python floats.
+
+        Args:
+            documents: Document dicts to store as payloads
+            embeddings: Matrix with one row per document; when omitted, each
+                document's 'embedding' field is used instead
+        """
+        if not documents:
+            return
+
+        if embeddings is None:
+            embeddings = np.stack([doc['embedding'] for doc in documents])
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.client.upload_collection(
             collection_name=self.collection_name,
-            points=points
+            vectors=vectors,
+            payload=[self._build_payload(doc) for doc in documents],
+            ids=[self._point_id(doc) for doc in documents],
+            batch_size=self.UPLOAD_BATCH_SIZE,
+            wait=True
         )
-        print(f"Inserted {len(documents)} document chunks into Qdrant")
+        logger.info("Inserted %d document chunks into Qdrant", len(documents))
 
     def search_similar(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict]:
         """Search for similar documents using cosine similarity."""
         search_result = self.client.query_points(
             collection_name=self.collection_name,
             query=query_embedding.tolist(),
-            limit=top_k
+            limit=top_k,
+            search_params=self.SEARCH_PARAMS,
+            with_payload=self.SEARCH_PAYLOAD_FIELDS,
         )
 
         return [self._format_search_result(hit) for hit in search_result.points]
 
+    async def asearch_similar(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """Search for similar documents without blocking the event loop."""
+        search_result = await self.aclient.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding.tolist(),
+            limit=top_k,
+            search_params=self.SEARCH_PARAMS,
+            with_payload=self.SEARCH_PAYLOAD_FIELDS,
+        )
+
+        return [self._format_search_result(hit) for hit in search_result.points]
+
+    def search_similar_batch(
+        self, query_embeddings: np.ndarray, top_ks: List[int]
+    ) -> List[List[Dict]]:
+        """Search for similar documents for several queries in a single round-trip."""
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=self._build_query_requests(query_embeddings, top_ks)
+        )
+
+        return [
+            [self._format_search_result(hit) for hit in response.points]
+            for response in responses
+        ]
+
+    async def asearch_similar_batch(
+        self, query_embeddings: np.ndarray, top_ks: List[int]
+    ) -> List[List[Dict]]:
+        """Search for several queries in a single round-trip without blocking the event loop."""
+        responses = await self.aclient.query_batch_points(
+            collection_name=self.collection_name,
+            requests=self._build_query_requests(query_embeddings, top_ks)
+        )
+
+        return [
+            [self._format_search_result(hit) for hit in response.points]
+            for response in responses
+        ]
+
     def get_last_scraped_date(self, source: str) -> Optional[datetime]:
         """Get the most recent published_date for a given source."""
-        if not self.client or not self._collection_exists() or self._collection_is_empty():
+        if not self.client or not self._collection_exists():
             return None
 
-        if not check_payload_index_exists(self.client, self.collection_name, "published_date"):
-            self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="published_date",
-                field_schema=PayloadSchemaType.DATETIME,
-            )
+        self._ensure_payload_index("published_date", PayloadSchemaType.DATETIME)
 
         return self._query_latest_document(source)
 
@@ -89,9 +194,15 @@ class VectorDatabase:
             self.client.close()
             print("Qdrant connection closed")
 
+    async def aclose(self):
+        """Close the async connection to Qdrant."""
+        if self.aclient:
+            await self.aclient.close()
+            print("Async Qdrant connection closed")
+
     def get_content_hash(self, source: str) -> Optional[str]:
         """Get the stored content hash for a given source."""
-        if not self.client or not self._collection_exists() or self._collection_is_empty():
+        if not self.client or not self._collection_exists():
             return None
 
         points, _ = self.client.scroll(
@@ -108,46 +219,134 @@ class VectorDatabase:
             return points[0].payload.get('content_hash')
         return None
 
-    def _create_point_from_document(self, doc: Dict) -> PointStruct:
-        """Convert document to Qdrant point."""
+    def get_etags(self, source: str) -> Dict[str, str]:
+        """Get the stored HTTP ETags for a given source, keyed by request URL."""
+        if not self.client or not self.client.collection_exists(self.state_collection_name):
+            return {}
+
+        etags = {}
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.state_collection_name,
+                scroll_filter={
+                    "must": [
+                        {"key": "source", "match": {"value": source}}
+                    ]
+                },
+                limit=self.SCRAPE_STATE_PAGE_SIZE,
+                offset=offset,
+                with_payload=["url", "etag"]
+            )
+            etags.update((point.payload['url'], point.payload['etag']) for point in points)
+            if offset is None:
+                return etags
+
+    def set_etags(self, source: str, etags: Dict[str, str]):
+        """Store HTTP ETags for a given source, keyed by request URL."""
+        if not etags:
+            return
+
+        if not self.client.collection_exists(self.state_collection_name):
+            # Scrape state has no vectors; it only rides along in Qdrant's payload store
+            self.client.create_collection(
+                collection_name=self.state_collection_name, vectors_config={}
+            )
+            self.client.create_payload_index(
+                collection_name=self.state_collection_name,
+                field_name="source",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
+        self.client.upsert(
+            collection_name=self.state_collection_name,
+            points=[
+                PointStruct(
+                    id=str(uuid5(NAMESPACE_URL, f"{source}|{url}")),
+                    vector={},
+                    payload={'source': source, 'url': url, 'etag': etag}
+                )
+                for url, etag in etags.items()
+            ]
+        )
+
+    @staticmethod
+    def _point_id(doc: Dict) -> str:
+        """
+        Derive a deterministic point id so re-ingesting a chunk overwrites it.
+
+        The content hash is part of the key when present, so a changed resume
+        gets new points instead of silently reusing the old ids.
+        """
+        key = f"{doc['source']}|{doc['url']}|{doc['chunk_index']}|{doc.get('content_hash', '')}"
+        return str(uuid5(NAMESPACE_URL, key))
+
+    def _build_payload(self, doc: Dict) -> Dict:
+        """Build the Qdrant payload for a document."""
         payload = {
             'title': doc['title'],
             'content': doc['content'],
             'source': doc['source'],
             'url': doc['url'],
-            'published_date': doc['published_date'].isoformat(),
+            'published_date': self._isoformat(doc['published_date']),
             'chunk_index': doc['chunk_index'],
         }
         if 'content_hash' in doc:
             payload['content_hash'] = doc['content_hash']
-        return PointStruct(
-            id=str(uuid4()),
-            vector=doc['embedding'].tolist(),
-            payload=payload
-        )
+        return payload
+
+    @staticmethod
+    def _isoformat(published_date) -> str:
+        """Return published_date as an ISO 8601 string, accepting pre-formatted values."""
+        if isinstance(published_date, str):
+            return published_date
+        return published_date.isoformat()
+
+    def _build_query_requests(
+        self, query_embeddings: np.ndarray, top_ks: List[int]
+    ) -> List[QueryRequest]:
+        """Build one Qdrant query request per embedding."""
+        return [
+            QueryRequest(
+                query=embedding.tolist(),
+                limit=top_k,
+                params=self.SEARCH_PARAMS,
+                with_payload=self.SEARCH_PAYLOAD_FIELDS,
+            )
+            for embedding, top_k in zip(query_embeddings, top_ks)
+        ]
 
     def _format_search_result(self, hit) -> Dict:
         """Format search result hit into dictionary."""
+        payload = hit.payload
         return {
             'id': hit.id,
-            'title': hit.payload['title'],
-            'content': hit.payload['content'],
-            'source': hit.payload['source'],
-            'url': hit.payload['url'],
-            'published_date': hit.payload['published_date'],
+            'title': payload['title'],
+            'content': payload['content'],
+            'source': payload['source'],
+            'url': payload['url'],
+            'published_date': payload['published_date'],
             'similarity': hit.score
         }
 
     def _collection_exists(self) -> bool:
-        """Check if the collection exists in Qdrant."""
-        collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
-        return self.collection_name in collection_names
-
-    def _collection_is_empty(self) -> bool:
-        """Check if the collection has any documents."""
-        count = self.client.count(collection_name=self.collection_name)
-        return count.count == 0
+        """Check if the collection exists in Qdrant, remembering a positive answer."""
+        if not self._collection_known_to_exist:
+            self._collection_known_to_exist = self.client.collection_exists(self.collection_name)
+        return self._collection_known_to_exist
+
+    def _ensure_payload_index(self, field_name: str, field_schema: PayloadSchemaType):
+        """Create a payload index if missing, checking Qdrant at most once per field."""
+        if field_name in self._indexed_fields:
+            return
+
+        if not check_payload_index_exists(self.client, self.collection_name, field_name):
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+        self._indexed_fields.add(field_name)
 
     def _query_latest_document(self, source: str) -> Optional[datetime]:
         """Query for the most recent document from a given source."""
@@ -1,5 +1,6 @@
 """Text chunking module for splitting documents into overlapping chunks."""
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Mapping
 
 
 class TextChunker:
@@ -12,48 +13,51 @@ class TextChunker:
     def chunk_text(self, text: str) -> List[str]:
         """Split text into overlapping chunks."""
         words = text.split()
-        chunks = []
-        step_size = self.chunk_size - self.overlap
-
-        i = 0
-        while i < len(words):
-            chunk_words = words[i:i + self.chunk_size]
-            chunk = ' '.join(chunk_words)
-            if chunk:
-                chunks.append(chunk)
+        if not words:
+            return []
 
-            # Break if we've consumed all words
-            if i + self.chunk_size >= len(words):
-                break
-
-            i += step_size
+        step_size = self.chunk_size - self.overlap
+        # The last window is the first one that reaches the end of the text
+        starts = range(0, max(len(words) - self.overlap, 1), step_size)
 
-        return chunks
+        return [' '.join(words[start:start + self.chunk_size]) for start in starts]
 
-    def chunk_documents(self, documents: List[Dict]) -> List[Dict]:
+    def chunk_documents(self, documents: List[Mapping]) -> List[Dict]:
         """
         Chunk multiple documents and preserve metadata.
 
         Args:
-            documents: List of dicts with 'content' and other metadata
+            documents: Scraped Documents (or dicts) with 'content' and other metadata
 
         Returns:
-            List of dicts with chunked content and preserved metadata
+            List of dicts with chunked content and preserved metadata.
+            ``published_date`` is converted to an ISO 8601 string once per
+            document so every chunk shares the same string.
         """
-        chunked_docs = []
+        return list(self.iter_chunks(documents))
 
+    def iter_chunks(self, documents: Iterable[Mapping]) -> Iterator[Dict]:
+        """
+        Lazily chunk documents, yielding chunks in document order.
+
+        Same output as chunk_documents, without holding every chunk in memory.
+        Documents flagged with ``needs_chunking=False`` become a single chunk
+        without being split into words.
+        """
         for doc in documents:
-            text_chunks = self.chunk_text(doc['content'])
+            if getattr(doc, 'needs_chunking', True):
+                text_chunks = self.chunk_text(doc['content'])
+            else:
+                text_chunks = [doc['content']]
+            if isinstance(doc.get('published_date'), datetime):
+                doc = {**doc, 'published_date': doc['published_date'].isoformat()}
 
             for chunk_index, chunk_content in enumerate(text_chunks):
-                chunked_doc = self._create_chunked_document(doc, chunk_content, chunk_index)
-                chunked_docs.append(chunked_doc)
-
-        return chunked_docs
+                yield self._create_chunked_document(doc, chunk_content, chunk_index)
 
     def _create_chunked_document(
         self,
-        original_doc: Dict,
+        original_doc: Mapping,
         chunk_content: str,
         chunk_index: int,
     ) -> Dict:
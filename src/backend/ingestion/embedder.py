@@ -1,17 +1,43 @@
 """Embedding module for generating and managing text embeddings."""
-from typing import List
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from fastembed import TextEmbedding
+from config.config import EMBEDDING_BATCH_SIZE, EMBEDDING_PROVIDERS
 from config.database import VectorDatabase
 
+logger = logging.getLogger(__name__)
+
 
 class Embedder:
     """Generates embeddings and stores them in Qdrant."""
 
-    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5"):
-        self.model = TextEmbedding(model_name=model_name)
-        self.embedding_dim = self._resolve_embedding_dim()
+    BATCH_SIZE = EMBEDDING_BATCH_SIZE
+    # fastembed starts a new worker pool per call, so only very large inputs repay it
+    PARALLEL_MIN_TEXTS = 1024
+    # Loaded models and their dimensions by name and execution providers, shared by
+    # every Embedder in the process
+    _models: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[TextEmbedding, int]] = {}
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en-v1.5",
+        providers: Optional[Sequence[str]] = EMBEDDING_PROVIDERS,
+    ):
+        # providers picks the ONNX Runtime execution providers, e.g. OpenVINOExecutionProvider
+        # on Intel CPUs; None leaves the choice to fastembed
+        providers = tuple(providers) if providers else None
+        key = (model_name, providers)
+        if key not in self._models:
+            self.model = TextEmbedding(model_name=model_name, providers=providers)
+            self._models[key] = (self.model, self._resolve_embedding_dim())
+        self.model, self.embedding_dim = self._models[key]
+
+    @classmethod
+    def reset_cache(cls):
+        """Forget loaded models, so the next Embedder loads its model again."""
+        cls._models.clear()
 
     def _resolve_embedding_dim(self) -> int:
         """Infer embedding dimension from the loaded model."""
@@ -20,29 +46,44 @@ class Embedder:
 
     def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text."""
-        embedding = list(self.model.embed([text]))[0]
-        return np.array(embedding)
+        # fastembed already yields float32 arrays, so asarray returns the row without copying it
+        embedding = next(iter(self.model.embed([text])))
+        return np.asarray(embedding)
 
     def embed_batch(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for multiple texts."""
-        embeddings = list(self.model.embed(texts))
-        return np.array(embeddings)
+        """
+        Generate embeddings for multiple texts, using all CPUs for large batches.
 
-    def _add_embeddings_to_documents(self, documents: List[dict], embeddings: np.ndarray) -> None:
-        """Add embeddings to document dictionaries in-place."""
-        for doc, embedding in zip(documents, embeddings):
-            doc['embedding'] = embedding
+        Rows are written into one preallocated float32 matrix as the model yields
+        them, instead of collecting a list of vectors and copying it afterwards.
+        Texts spanning several model batches are encoded shortest first, since each
+        batch is padded to its longest text; rows are still returned in input order.
+        """
+        parallel = 0 if len(texts) >= self.PARALLEL_MIN_TEXTS else None
+        embeddings = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        if len(texts) > self.BATCH_SIZE:
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            texts = [texts[i] for i in order]
+        else:
+            order = range(len(texts))
+        vectors = self.model.embed(texts, batch_size=self.BATCH_SIZE, parallel=parallel)
+        for index, vector in zip(order, vectors):
+            embeddings[index] = vector
+        return embeddings
 
-    def embed_documents(self, documents: List[dict]) -> None:
+    def embed_documents(self, documents: List[dict]) -> np.ndarray:
         """
-        Generate embeddings for documents and add them in-place.
+        Generate embeddings for documents.
 
         Args:
             documents: List of document dicts with 'content' field
+
+        Returns:
+            Contiguous float32 matrix with one row per document, in document order
         """
-        print(f"Generating embeddings for {len(documents)} chunks...")
+        logger.info("Generating embeddings for %d chunks...", len(documents))
         embeddings = self.embed_batch([doc['content'] for doc in documents])
-        self._add_embeddings_to_documents(documents, embeddings)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
     def store(self, documents: List[dict], vector_db: VectorDatabase):
         """
@@ -52,8 +93,8 @@ class Embedder:
             documents: List of document dicts with 'content' field
             vector_db: Connected VectorDatabase instance
         """
-        self.embed_documents(documents)
+        embeddings = self.embed_documents(documents)
 
-        print("Storing embeddings in Qdrant...")
-        vector_db.insert_documents(documents)
-        print(f"Successfully embedded and stored {len(documents)} chunks")
+        logger.info("Storing embeddings in Qdrant...")
+        vector_db.insert_documents(documents, embeddings)
+        logger.info("Successfully embedded and stored %d chunks", len(documents))
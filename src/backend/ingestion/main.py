@@ -3,8 +3,12 @@ Main ingestion pipeline script.
 Scrapes content, chunks it, embeds it, and stores in Qdrant.
 """
 import argparse
+import asyncio
+import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+from itertools import islice
 from ingestion.source_registry import SourceRegistry
 from ingestion.chunker import TextChunker
 from ingestion.embedder import Embedder
@@ -15,12 +19,30 @@ from config.config import EMBEDDING_MODEL
 class IngestionPipeline:
     """Orchestrates the full ingestion pipeline for scraping, chunking, and embedding content."""
 
+    # Kept below Embedder.PARALLEL_MIN_TEXTS: fastembed starts a fresh worker pool, each
+    # loading the model, on every parallel call, which a batch this size cannot repay
+    EMBED_BATCH_SIZE = 256
+    # Embedded batches waiting for Qdrant; bounds memory if writes fall behind
+    WRITE_QUEUE_SIZE = 4
+    # Sources whose scrapers send conditional requests and expose the ETags they received
+    ETAG_SOURCES = ("github", "medium", "resume")
+
     def __init__(self, embedding_model=EMBEDDING_MODEL, sources=None):
         self.embedding_model = embedding_model
         self.sources = set(sources) if sources else set(SourceRegistry.get_sources())
+        # Sources and the environment are fixed for the pipeline's lifetime
+        self._active_sources = [
+            source for source in SourceRegistry.get_sources()
+            if source in self.sources and os.getenv(SourceRegistry.get_env_var(source))
+        ]
+        self._active_sources_label = ', '.join(sorted(self._active_sources))
         self.vector_db = None
         self.chunker = TextChunker()
         self.embedder = None
+        self._scrapers = {}
+        self._write_queue = None
+        self._writer = None
+        self._write_error = None
 
     def __enter__(self):
         """Context manager entry: connect to database."""
@@ -39,53 +61,145 @@ class IngestionPipeline:
         self.vector_db.connect()
 
     def _scrape_content(self):
-        """Scrape content from sources in parallel."""
-        active_sources = [
-            source for source in SourceRegistry.get_sources()
-            if source in self.sources and os.getenv(SourceRegistry.get_env_var(source))
-        ]
+        """
+        Scrape content from sources concurrently on an event loop in a background thread.
+
+        Yields each source's name, documents and scraper as soon as that
+        source finishes, so callers can chunk and embed them while the
+        remaining sources are still being scraped.
+        """
+        active_sources = self._active_sources
         skipped = self.sources - set(active_sources)
         for source in skipped:
             print(f"Skipping {source}: {SourceRegistry.get_env_var(source)} not set")
 
-        print(f"\n[2/5] Scraping content from: {', '.join(sorted(active_sources))}...")
-        documents = []
+        print(f"\n[2/5] Scraping content from: {self._active_sources_label}...")
+
+        # Read scrape state up front so the scraping thread never shares the Qdrant client
+        scrape_kwargs = {source: self._get_scrape_kwargs(source) for source in active_sources}
+        scrapers = {source: self._get_scraper(source) for source in active_sources}
+        if not active_sources:
+            return
+
+        results = queue.Queue()
+        scraping = threading.Thread(
+            target=asyncio.run,
+            args=(self._scrape_all(scrapers, scrape_kwargs, results),),
+            name="scrapers",
+            daemon=True,
+        )
+        scraping.start()
+
+        for _ in active_sources:
+            source, documents, error = results.get()
+            if error is not None:
+                raise error
+            print(f"Scraped {len(documents)} {source} documents")
+            yield source, documents, scrapers[source]
+        scraping.join()
 
-        with ThreadPoolExecutor(max_workers=len(active_sources) or 1) as executor:
-            futures = {
-                executor.submit(self._scrape_source, SourceRegistry.get_scraper_class(source), source): source
-                for source in active_sources
-            }
-            for future in as_completed(futures):
-                documents.extend(future.result())
+    async def _scrape_all(self, scrapers, scrape_kwargs, results):
+        """Run every scraper concurrently, reporting each one's outcome to results as it finishes."""
+        async def scrape(source):
+            try:
+                documents = await scrapers[source].scrape_async(**scrape_kwargs[source])
+            except Exception as e:
+                results.put((source, None, e))
+            else:
+                results.put((source, documents, None))
 
-        print(f"Scraped {len(documents)} documents")
-        return documents
+        await asyncio.gather(*(scrape(source) for source in scrapers))
 
-    def _scrape_source(self, scraper_class, source_name):
-        """Scrape content from a source using the provided scraper class."""
+    def _get_scraper(self, source_name):
+        """Return the pipeline's scraper for a source, creating it on first use."""
+        if source_name not in self._scrapers:
+            self._scrapers[source_name] = SourceRegistry.get_scraper_class(source_name)()
+        return self._scrapers[source_name]
+
+    def _get_scrape_kwargs(self, source_name):
+        """Look up the stored state a source's scraper needs to skip old content."""
         last_scraped = self.vector_db.get_last_scraped_date(source_name)
         if last_scraped:
             print(f"Last {source_name.title()} scrape: {last_scraped}")
-        scraper = scraper_class()
         kwargs = {"last_scraped_date": last_scraped}
         if source_name == "resume":
             kwargs["stored_hash"] = self.vector_db.get_content_hash("resume")
-        return scraper.scrape(**kwargs)
+        if source_name in self.ETAG_SOURCES:
+            kwargs["etags"] = self.vector_db.get_etags(source_name)
+        return kwargs
+
+    def _save_scrape_state(self, source_name, scraper):
+        """Persist the state a source's scraper collected, once its documents are stored."""
+        if source_name in self.ETAG_SOURCES:
+            self.vector_db.set_etags(source_name, scraper.etags)
 
     def _chunk_documents(self, documents):
-        """Chunk documents into smaller pieces."""
+        """Lazily chunk documents into smaller pieces."""
         print("\n[3/5] Chunking documents...")
-        chunked_docs = self.chunker.chunk_documents(documents)
-        print(f"✓ Created {len(chunked_docs)} chunks")
-        return chunked_docs
+        return self.chunker.iter_chunks(documents)
 
     def _embed_and_store(self, chunked_docs):
-        """Generate embeddings and store in database."""
+        """
+        Generate embeddings and store in database, in batches of EMBED_BATCH_SIZE chunks.
+
+        ``chunked_docs`` may be a lazy iterable; only one batch of chunks is
+        materialized at a time. While the writer thread is running, each batch
+        is handed to it so the next batch is embedded while the previous one
+        is being uploaded.
+        """
         print("\n[4/5] Generating embeddings and storing...")
-        self.embedder = Embedder(model_name=self.embedding_model)
-        self.vector_db.setup_database(embedding_dim=self.embedder.embedding_dim)
-        self.embedder.store(chunked_docs, self.vector_db)
+        if self.embedder is None:
+            self.embedder = Embedder(model_name=self.embedding_model)
+            self._submit_write(self.vector_db.setup_database, embedding_dim=self.embedder.embedding_dim)
+
+        chunk_count = 0
+        chunks = iter(chunked_docs)
+        while batch := list(islice(chunks, self.EMBED_BATCH_SIZE)):
+            chunk_count += len(batch)
+            embeddings = self.embedder.embed_documents(batch)
+            self._submit_write(self.vector_db.insert_documents, batch, embeddings)
+        print(f"✓ Created {chunk_count} chunks")
+
+    def _start_writer(self):
+        """Start the thread that applies Qdrant writes in submission order."""
+        self._write_queue = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._write_error = None
+        self._writer = threading.Thread(target=self._drain_writes, name="qdrant-writer", daemon=True)
+        self._writer.start()
+
+    def _stop_writer(self):
+        """Wait for queued writes to finish, re-raising the first write failure."""
+        if self._writer is None:
+            return
+        self._write_queue.put(None)
+        self._writer.join()
+        self._write_queue = None
+        self._writer = None
+        if self._write_error is not None:
+            raise self._write_error
+
+    def _submit_write(self, write, *args, **kwargs):
+        """Queue a Qdrant write for the writer thread, or run it inline if none is running."""
+        if self._write_queue is None:
+            write(*args, **kwargs)
+            return
+        if self._write_error is not None:
+            raise self._write_error
+        self._write_queue.put((write, args, kwargs))
+
+    def _drain_writes(self):
+        """Run queued writes until the stop sentinel, skipping the rest after a failure."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            if self._write_error is not None:
+                continue
+            write, args, kwargs = item
+            try:
+                write(*args, **kwargs)
+            except Exception as e:
+                self._write_error = e
 
     def _close_database(self):
         """Close database connection."""
@@ -94,20 +208,34 @@ class IngestionPipeline:
             self.vector_db.close()
 
     def run(self):
-        """Execute the full ingestion pipeline."""
+        """
+        Execute the full ingestion pipeline.
+
+        Scraping runs in background threads while documents from sources that
+        have already finished are chunked and embedded, and a writer thread
+        uploads embedded batches to Qdrant while the next batch is embedded.
+        """
         print("=" * 60)
         print("Starting Ingestion Pipeline")
         print("=" * 60)
 
-        documents = self._scrape_content()
+        document_count = 0
+        self._start_writer()
+        try:
+            for source, documents, scraper in self._scrape_content():
+                if documents:
+                    document_count += len(documents)
+                    self._embed_and_store(self._chunk_documents(documents))
+                # Queued behind the source's documents, so state is saved only once they are stored
+                self._submit_write(self._save_scrape_state, source, scraper)
+        finally:
+            self._stop_writer()
 
-        if not documents:
+        if not document_count:
             print("No documents found. Please check your configuration.")
             return
 
-        chunked_docs = self._chunk_documents(documents)
-        self._embed_and_store(chunked_docs)
-
+        print(f"\nIngested {document_count} documents")
         print("\n" + "=" * 60)
         print("✓ Ingestion Pipeline Complete!")
         print("=" * 60)
@@ -125,6 +253,7 @@ def _parse_args():
     return parser.parse_args()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     args = _parse_args()
 
     with IngestionPipeline(sources=args.sources) as pipeline:
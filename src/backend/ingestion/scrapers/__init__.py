@@ -1,13 +1,24 @@
-"""Scrapers module for collecting content from various sources."""
-
-from ingestion.scrapers.base import BaseScraper
-from ingestion.scrapers.github import GitHubScraper
-from ingestion.scrapers.medium import MediumScraper
-from ingestion.scrapers.resume import ResumeScraper
-
-__all__ = [
-    "BaseScraper",
-    "GitHubScraper",
-    "MediumScraper",
-    "ResumeScraper",
-]
+"""Scrapers module for collecting content from various sources.
+
+Scraper classes are imported on first access, so loading one scraper does
+not pull in every other scraper's dependencies (httpx, pdfplumber, gdown,
+feedparser, ...).
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "BaseScraper": "ingestion.scrapers.base",
+    "Document": "ingestion.scrapers.base",
+    "GitHubScraper": "ingestion.scrapers.github",
+    "MediumScraper": "ingestion.scrapers.medium",
+    "ResumeScraper": "ingestion.scrapers.resume",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import an exported scraper class from its module on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name]), name)
@@ -1,9 +1,59 @@
 """Base scraper class with common functionality for all scrapers."""
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterator, List, Dict, Optional
 from datetime import datetime
 
 
+@dataclass(frozen=True, slots=True)
+class Document(Mapping):
+    """
+    A scraped document, stored as a fixed-layout record instead of a dict.
+
+    Documents also behave as read-only mappings, so code written against the
+    old dict documents (``doc['content']``, ``{**doc, ...}``) keeps working.
+    ``content_hash`` is only present as a key when it is set, matching the
+    sources that dedupe by content. ``needs_chunking`` is a hint for the
+    chunker rather than document data, so it is not exposed as a key.
+    """
+
+    title: str
+    content: str
+    url: str
+    published_date: datetime
+    source: str
+    metadata: Mapping = field(default_factory=dict)
+    content_hash: Optional[str] = None
+    needs_chunking: bool = True
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _DOCUMENT_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in _OPTIONAL_DOCUMENT_FIELDS:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            key for key in _DOCUMENT_FIELDS
+            if key not in _OPTIONAL_DOCUMENT_FIELDS or getattr(self, key) is not None
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict:
+        """Return the document as a plain dict, e.g. for building Qdrant payloads."""
+        return dict(self)
+
+
+_DOCUMENT_FIELDS = tuple(f.name for f in fields(Document) if f.name != 'needs_chunking')
+_OPTIONAL_DOCUMENT_FIELDS = frozenset({'content_hash'})
+
+
 class BaseScraper(ABC):
     """Abstract base class for all content scrapers."""
 
@@ -19,7 +69,7 @@ class BaseScraper(ABC):
         self.username = username
 
     @abstractmethod
-    def scrape(self, last_scraped_date: Optional[datetime] = None) -> List[Dict]:
+    def scrape(self, last_scraped_date: Optional[datetime] = None) -> List[Document]:
         """
         Scrape content from the source.
 
@@ -31,9 +81,18 @@ class BaseScraper(ABC):
         """
         pass
 
+    async def scrape_async(self, *args, **kwargs) -> List[Document]:
+        """
+        Scrape content without blocking the event loop.
+
+        Runs the synchronous ``scrape`` in a worker thread; scrapers with
+        native async I/O override this.
+        """
+        return await asyncio.to_thread(self.scrape, *args, **kwargs)
+
     def _filter_by_date(
-        self, documents: List[Dict], last_scraped_date: Optional[datetime] = None
-    ) -> List[Dict]:
+        self, documents: List[Document], last_scraped_date: Optional[datetime] = None
+    ) -> List[Document]:
         """
         Filter documents to only include those newer than last_scraped_date.
 
@@ -49,7 +108,7 @@ class BaseScraper(ABC):
 
         return [
             doc for doc in documents
-            if doc['published_date'] > last_scraped_date
+            if doc.published_date > last_scraped_date
         ]
 
     def _create_document(
@@ -59,9 +118,11 @@ class BaseScraper(ABC):
         url: str,
         published_date: datetime,
         metadata: Optional[Dict] = None,
-    ) -> Dict:
+        content_hash: Optional[str] = None,
+        needs_chunking: bool = True,
+    ) -> Document:
         """
-        Create a standardized document dictionary.
+        Create a standardized document.
 
         Args:
             title: Document title
@@ -69,15 +130,20 @@ class BaseScraper(ABC):
             url: Document URL
             published_date: Publication date
             metadata: Optional metadata dictionary
+            content_hash: Optional hash of the raw source, for content-based dedup
+            needs_chunking: False when the content is known to fit in one chunk,
+                letting the chunker skip splitting it
 
         Returns:
-            Standardized document dictionary
+            Standardized Document
         """
-        return {
-            'title': title,
-            'content': content,
-            'url': url,
-            'published_date': published_date,
-            'source': self.SOURCE_NAME,
-            'metadata': metadata or {},
-        }
+        return Document(
+            title=title,
+            content=content,
+            url=url,
+            published_date=published_date,
+            source=self.SOURCE_NAME,
+            metadata=metadata or {},
+            content_hash=content_hash,
+            needs_chunking=needs_chunking,
+        )
@@ -1,18 +1,105 @@
 """GitHub scraper for fetching profile and repository information."""
+import asyncio
 import os
-import requests
-from typing import List, Dict, Optional
+import time
+from sys import intern
+import httpx
+import orjson
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from ingestion.scrapers.base import BaseScraper
+from urllib.parse import parse_qs, urlparse
+from ingestion.scrapers.base import BaseScraper, Document
+
+
+class _RateLimiter:
+    """
+    Paces requests from GitHub's rate-limit headers before the quota runs out.
+
+    Only kicks in once fewer requests remain than can be in flight at once;
+    below that, requests are spread evenly over the time left until reset.
+    """
+
+    def __init__(self, min_remaining: int, max_wait_seconds: float):
+        self.min_remaining = min_remaining
+        self.max_wait_seconds = max_wait_seconds
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    def update(self, response: httpx.Response) -> None:
+        """Record the quota reported by a response, if it carries rate-limit headers."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_at = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset_at is not None:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset_at)
+
+    def delay(self) -> float:
+        """Return how long to wait before the next request."""
+        if self.remaining is None or self.remaining >= self.min_remaining:
+            return 0.0
+        time_left = self.reset_at - time.time()
+        if time_left <= 0:
+            return 0.0
+        return min(time_left / max(self.remaining, 1), self.max_wait_seconds)
+
+    async def acquire(self) -> None:
+        """Sleep if the remaining quota needs to be stretched until the reset."""
+        wait = self.delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 class GitHubScraper(BaseScraper):
     """Scrapes GitHub profile and repositories via GitHub API."""
 
     API_BASE_URL = "https://api.github.com"
+    GRAPHQL_URL = f"{API_BASE_URL}/graphql"
     SOURCE_NAME = "github"
     REPOS_PER_PAGE = 100
+    MAX_CONCURRENT_REQUESTS = 8
+    MAX_RETRIES = 5
+    MAX_RETRY_WAIT_SECONDS = 60
+    RETRY_BACKOFF_SECONDS = 0.3
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    CONNECT_RETRIES = 2
+    MAX_CONNECTIONS = 16
+    REQUEST_TIMEOUT_SECONDS = 10.0
     CONTENT_SEPARATOR = " | "
+    OPTIONAL_PROFILE_FIELDS = (
+        ('bio', 'Bio'),
+        ('company', 'Company'),
+        ('location', 'Location'),
+        ('blog', 'Blog'),
+    )
+    # Selects only the fields the document builders use, so the profile and
+    # up to REPOS_PER_PAGE repositories arrive in a single round-trip. Later
+    # cursor pages skip the profile fields via $includeProfile.
+    GRAPHQL_QUERY = """
+    query($login: String!, $cursor: String, $includeProfile: Boolean!) {
+      user(login: $login) {
+        ...Profile @include(if: $includeProfile)
+        repositories(
+          first: 100, after: $cursor, privacy: PUBLIC, ownerAffiliations: OWNER,
+          orderBy: {field: UPDATED_AT, direction: DESC}
+        ) {
+          pageInfo { hasNextPage endCursor }
+          nodes {
+            name description url updatedAt isFork stargazerCount forkCount
+            primaryLanguage { name }
+            issues(states: OPEN) { totalCount }
+            repositoryTopics(first: 20) { nodes { topic { name } } }
+          }
+        }
+      }
+    }
+
+    fragment Profile on User {
+      login name bio company location websiteUrl url createdAt updatedAt
+      followers { totalCount }
+      following { totalCount }
+      publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    }
+    """
 
     def __init__(self, username: Optional[str] = None, token: Optional[str] = None):
         """
@@ -32,82 +119,393 @@ class GitHubScraper(BaseScraper):
         
         super().__init__(username)
         self.token = token
-        self.session = self._create_session()
+        self.headers = self._build_headers()
+        self.etags = {}
+        self.rate_limiter = _RateLimiter(self.MAX_CONCURRENT_REQUESTS, self.MAX_RETRY_WAIT_SECONDS)
 
-    def scrape(self, last_scraped_date: Optional[datetime] = None) -> List[Dict]:
-        """Fetch user profile and repositories, filtering by last_scraped_date."""
-        documents = []
+    def scrape(
+        self, last_scraped_date: Optional[datetime] = None, etags: Optional[Dict[str, str]] = None
+    ) -> List[Document]:
+        """
+        Fetch user profile and repositories, filtering by last_scraped_date.
 
-        # Scrape profile info
-        profile_doc = self._scrape_profile()
-        if profile_doc:
-            documents.append(profile_doc)
+        Args:
+            last_scraped_date: Only return documents newer than this date
+            etags: ETags from the previous run, keyed by request URL; sent as
+                ``If-None-Match`` so unchanged resources come back as 304. The
+                ETags seen during this run are left in ``self.etags``.
+        """
+        return asyncio.run(self.scrape_async(last_scraped_date, etags))
+
+    async def scrape_async(
+        self, last_scraped_date: Optional[datetime] = None, etags: Optional[Dict[str, str]] = None
+    ) -> List[Document]:
+        """Async version of scrape, for callers that already run an event loop."""
+        # Without stored documents a 304 would leave nothing ingested, so fetch unconditionally
+        self.etags = dict(etags or {}) if last_scraped_date is not None else {}
+        return await self._scrape_async(last_scraped_date)
+
+    async def _scrape_async(self, last_scraped_date: Optional[datetime] = None) -> List[Document]:
+        """Fetch the profile and every repository page over one HTTP/2 connection."""
+        async with self._create_client() as client:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            documents = None
+            # The GraphQL API rejects unauthenticated requests, so REST is the fallback
+            if self.token:
+                if await self._unchanged_since_last_scrape(client, semaphore):
+                    print("GitHub profile and repositories unchanged since last scrape")
+                    return []
+                documents = await self._scrape_graphql(client, semaphore, last_scraped_date)
+            if documents is None:
+                documents = await self._scrape_rest(client, semaphore, last_scraped_date)
+
+        print(f"Scraped {len(documents)} GitHub documents")
+        return documents
+
+    async def _scrape_rest(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        last_scraped_date: Optional[datetime] = None,
+    ) -> List[Document]:
+        """Fetch the profile and repositories newer than last_scraped_date through the REST API."""
+        profile_doc, repo_docs = await asyncio.gather(
+            self._scrape_profile(client, semaphore),
+            self._scrape_repositories(client, semaphore, last_scraped_date),
+        )
 
-        # Scrape repositories
-        repo_docs = self._scrape_repositories()
+        documents = self._filter_by_date([profile_doc] if profile_doc else [], last_scraped_date)
         documents.extend(repo_docs)
+        return documents
+
+    async def _scrape_graphql(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        last_scraped_date: Optional[datetime] = None,
+    ) -> Optional[List[Document]]:
+        """
+        Fetch the profile and repositories newer than last_scraped_date through the GraphQL API.
 
-        # Filter all documents by date
-        filtered_docs = self._filter_by_date(documents, last_scraped_date)
-        print(f"Scraped {len(filtered_docs)} GitHub documents")
-        return filtered_docs
+        Repositories arrive most recently updated first, so pagination stops
+        at the first page that reaches last_scraped_date. Returns None when
+        the query fails so the caller can fall back to REST.
+        """
+        documents = []
+        cursor = None
+        while True:
+            user = await self._fetch_graphql_user(client, semaphore, cursor)
+            if user is None:
+                return None
+
+            if cursor is None:
+                profile_doc = self._parse_profile(self._normalize_graphql_profile(user))
+                documents.extend(self._filter_by_date([profile_doc], last_scraped_date))
+            repositories = user['repositories']
+            repo_list = [self._normalize_graphql_repository(node) for node in repositories['nodes']]
+            documents.extend(
+                self._parse_repository(repo_data)
+                for repo_data in self._new_repositories(repo_list, last_scraped_date)
+            )
+
+            page_info = repositories['pageInfo']
+            if not page_info['hasNextPage'] or self._reaches_last_scrape(repo_list, last_scraped_date):
+                return documents
+            cursor = page_info['endCursor']
+
+    async def _unchanged_since_last_scrape(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore
+    ) -> bool:
+        """
+        Check with conditional REST requests whether anything changed upstream.
 
-    def _create_session(self) -> requests.Session:
-        """Create HTTP session with authentication if token provided."""
-        session = requests.Session()
+        GraphQL responses carry no ETag, so the profile and the most recently
+        updated repository are probed instead. A 304 costs no rate-limit quota.
+        """
+        params = {"per_page": 1, "sort": "updated", "direction": "desc"}
+        try:
+            responses = await asyncio.gather(
+                self._conditional_get(client, semaphore, f"{self.API_BASE_URL}/users/{self.username}"),
+                self._conditional_get(
+                    client, semaphore, f"{self.API_BASE_URL}/users/{self.username}/repos", params=params
+                ),
+            )
+        except httpx.HTTPError as e:
+            print(f"Error checking GitHub for changes: {e}")
+            return False
+        return all(self._is_unchanged(response) for response in responses)
+
+    async def _fetch_graphql_user(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, cursor: Optional[str]
+    ) -> Optional[Dict]:
+        """Run the GraphQL query for one page of repositories, returning the user node."""
+        payload = {
+            "query": self.GRAPHQL_QUERY,
+            "variables": {"login": self.username, "cursor": cursor, "includeProfile": cursor is None},
+        }
+        try:
+            response = await self._request(
+                client, semaphore, "POST", self.GRAPHQL_URL,
+                json=payload, headers={"Authorization": f"bearer {self.token}"}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except httpx.HTTPError as e:
+            print(f"Error querying GitHub GraphQL API: {e}")
+            return None
+
+        user = (data.get("data") or {}).get("user")
+        if data.get("errors") or user is None:
+            print(f"Error querying GitHub GraphQL API: {data.get('errors')}")
+            return None
+        return user
+
+    @staticmethod
+    def _normalize_graphql_profile(user: Dict) -> Dict:
+        """Map a GraphQL user node onto the REST profile fields the parsers read."""
+        return {
+            'login': user['login'],
+            'name': user.get('name'),
+            'bio': user.get('bio'),
+            'company': user.get('company'),
+            'location': user.get('location'),
+            'blog': user.get('websiteUrl'),
+            'html_url': user['url'],
+            'public_repos': user['publicRepos']['totalCount'],
+            'followers': user['followers']['totalCount'],
+            'following': user['following']['totalCount'],
+            'created_at': user['createdAt'],
+            'updated_at': user['updatedAt'],
+        }
+
+    @staticmethod
+    def _normalize_graphql_repository(node: Dict) -> Dict:
+        """Map a GraphQL repository node onto the REST repository fields the parsers read."""
+        language = node.get('primaryLanguage') or {}
+        return {
+            'name': node['name'],
+            'description': node.get('description'),
+            'language': language.get('name'),
+            'stargazers_count': node['stargazerCount'],
+            'forks_count': node['forkCount'],
+            'open_issues_count': node['issues']['totalCount'],
+            'topics': [topic['topic']['name'] for topic in node['repositoryTopics']['nodes']],
+            'html_url': node['url'],
+            'updated_at': node['updatedAt'],
+            'fork': node['isFork'],
+        }
+
+    def _build_headers(self) -> Dict[str, str]:
+        """Build request headers with authentication if token provided."""
+        headers = {"Accept": "application/vnd.github+json"}
         if self.token:
-            session.headers.update({"Authorization": f"token {self.token}"})
-        return session
+            headers["Authorization"] = f"token {self.token}"
+        return headers
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create an HTTP/2 client so concurrent requests share one connection.
 
-    def _scrape_profile(self) -> Optional[Dict]:
+        The transport retries failed connection attempts; retries for
+        rate limits and transient 5xx responses happen in _request.
+        """
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=self.CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_CONNECTIONS,
+            ),
+        )
+        return httpx.AsyncClient(
+            transport=transport, headers=self.headers, timeout=self.REQUEST_TIMEOUT_SECONDS
+        )
+
+    async def _scrape_profile(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore
+    ) -> Optional[Document]:
         """Fetch and parse user profile information."""
         url = f"{self.API_BASE_URL}/users/{self.username}"
         try:
-            response = self.session.get(url)
+            response = await self._conditional_get(client, semaphore, url)
+            if self._is_unchanged(response):
+                return None
             response.raise_for_status()
-            user_data = response.json()
+            user_data = orjson.loads(response.content)
             return self._parse_profile(user_data)
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error fetching GitHub profile: {e}")
             return None
 
-    def _scrape_repositories(self) -> List[Dict]:
-        """Fetch and parse user repositories."""
-        repos = []
-        page = 1
-        per_page = self.REPOS_PER_PAGE
+    async def _scrape_repositories(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        last_scraped_date: Optional[datetime] = None,
+    ) -> List[Document]:
+        """
+        Fetch and parse user repositories updated after last_scraped_date.
+
+        The first page tells us how many pages there are (via the ``Link``
+        header), so the remaining pages are fetched concurrently, up to
+        MAX_CONCURRENT_REQUESTS at a time. Pages are sorted by last update, so
+        fetching stops once a page reaches last_scraped_date or comes back 304:
+        an updated repository moves to the front and shifts every page before
+        its old position, so an unchanged page means no later page changed.
+        Only repositories newer than last_scraped_date are parsed into documents.
+        """
+        first_page, response = await self._fetch_repo_page(client, semaphore, 1)
+        if self._is_unchanged(response):
+            return []
+        wave_pages = [first_page]
+        pages = list(wave_pages)
+
+        last_page = self._parse_last_page(response)
+        next_page = 2
+        unchanged = False
+        while next_page <= last_page and not unchanged and not any(
+            self._reaches_last_scrape(repo_list, last_scraped_date) for repo_list in wave_pages
+        ):
+            wave = range(next_page, min(next_page + self.MAX_CONCURRENT_REQUESTS, last_page + 1))
+            results = await asyncio.gather(*(
+                self._fetch_repo_page(client, semaphore, page) for page in wave
+            ))
+            wave_pages = [repo_list for repo_list, _ in results]
+            pages.extend(wave_pages)
+            unchanged = any(self._is_unchanged(page_response) for _, page_response in results)
+            next_page = wave.stop
+
+        return [
+            self._parse_repository(repo_data)
+            for repo_list in pages
+            for repo_data in self._new_repositories(repo_list, last_scraped_date)
+        ]
+
+    @staticmethod
+    def _is_unchanged(response: Optional[httpx.Response]) -> bool:
+        """Return True if a conditional request came back 304 Not Modified."""
+        return response is not None and response.status_code == 304
+
+    def _reaches_last_scrape(self, repo_list: List[Dict], last_scraped_date: Optional[datetime]) -> bool:
+        """Return True if a page sorted newest-first ends at or before last_scraped_date."""
+        return (
+            last_scraped_date is not None
+            and bool(repo_list)
+            and self._parse_iso_date(repo_list[-1]['updated_at']) <= last_scraped_date
+        )
 
-        while True:
-            url = f"{self.API_BASE_URL}/users/{self.username}/repos"
-            params = {
-                "per_page": per_page,
-                "page": page,
-                "sort": "updated",
-                "direction": "desc",
-            }
+    def _new_repositories(self, repo_list: List[Dict], last_scraped_date: Optional[datetime]) -> List[Dict]:
+        """Return the raw repositories updated after last_scraped_date, before any are parsed."""
+        if last_scraped_date is None:
+            return repo_list
+        return [
+            repo_data for repo_data in repo_list
+            if self._parse_iso_date(repo_data['updated_at']) > last_scraped_date
+        ]
 
-            try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                repo_list = response.json()
+    async def _fetch_repo_page(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, page: int
+    ) -> Tuple[List[Dict], Optional[httpx.Response]]:
+        """Fetch one page of repositories, returning its items and the raw response."""
+        url = f"{self.API_BASE_URL}/users/{self.username}/repos"
+        params = {
+            "per_page": self.REPOS_PER_PAGE,
+            "page": page,
+            "sort": "updated",
+            "direction": "desc",
+        }
+
+        try:
+            response = await self._conditional_get(client, semaphore, url, params=params)
+            if self._is_unchanged(response):
+                return [], response
+            response.raise_for_status()
+            return orjson.loads(response.content), response
+        except httpx.HTTPError as e:
+            print(f"Error fetching GitHub repositories (page {page}): {e}")
+            return [], None
+
+    async def _conditional_get(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        params: Optional[Dict] = None,
+    ) -> httpx.Response:
+        """GET a URL with the ETag from the last run, remembering the ETag it returns."""
+        key = str(httpx.URL(url, params=params))
+        headers = {"If-None-Match": self.etags[key]} if key in self.etags else None
+
+        response = await self._request(client, semaphore, "GET", url, params=params, headers=headers)
+        if response.status_code == 200 and response.headers.get("ETag"):
+            self.etags[key] = response.headers["ETag"]
+        return response
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request, pacing by the remaining quota and retrying rate limits and server errors."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            async with semaphore:
+                await self.rate_limiter.acquire()
+                response = await client.request(method, url, **kwargs)
+            self.rate_limiter.update(response)
+            wait = self._retry_wait(response, attempt)
+            if wait is None or attempt == self.MAX_RETRIES:
+                return response
+            print(f"GitHub returned {response.status_code}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+        return response
+
+    def _retry_wait(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying a response, or None if it should not be retried."""
+        rate_limit_wait = self._rate_limit_wait(response)
+        if rate_limit_wait is not None:
+            return rate_limit_wait
+
+        if response.status_code in self.RETRY_STATUS_CODES:
+            return min(self.RETRY_BACKOFF_SECONDS * 2 ** attempt, self.MAX_RETRY_WAIT_SECONDS)
+
+        return None
+
+    def _rate_limit_wait(self, response: httpx.Response) -> Optional[float]:
+        """Return how long to wait before retrying a rate-limited response, or None."""
+        if response.status_code not in (403, 429):
+            return None
 
-                if not repo_list:
-                    break
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            return min(float(retry_after), self.MAX_RETRY_WAIT_SECONDS)
 
-                for repo_data in repo_list:
-                    repo_doc = self._parse_repository(repo_data)
-                    repos.append(repo_doc)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset_at = float(response.headers.get("X-RateLimit-Reset", time.time()))
+            return min(max(reset_at - time.time(), 1), self.MAX_RETRY_WAIT_SECONDS)
 
-                page += 1
+        return None
 
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching GitHub repositories: {e}")
-                break
+    @staticmethod
+    def _parse_last_page(response: Optional[httpx.Response]) -> int:
+        """Read the last page number from a paginated response's ``Link`` header."""
+        if response is None:
+            return 1
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return 1
+        return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
 
-        return repos
+    def _parse_profile(self, user_data: Dict) -> Document:
+        """
+        Transform user API response into a document.
 
-    def _parse_profile(self, user_data: Dict) -> Dict:
-        """Transform user API response into document dictionary."""
+        Profile and repository content is bounded by GitHub's field limits
+        (e.g. 160-character bios, 350-character descriptions), so both are
+        marked as fitting in a single chunk.
+        """
         profile_parts = self._extract_profile_parts(user_data)
         content = self._build_content(profile_parts)
         metadata = self._build_profile_metadata(user_data)
@@ -117,13 +515,13 @@ class GitHubScraper(BaseScraper):
             content=content,
             url=user_data['html_url'],
             published_date=self._parse_iso_date(user_data['updated_at']),
-            metadata=metadata
+            metadata=metadata,
+            needs_chunking=False
         )
 
-    def _parse_repository(self, repo_data: Dict) -> Dict:
-        """Transform repository API response into document dictionary."""
-        repo_parts = self._extract_repo_parts(repo_data)
-        content = self._build_content(repo_parts)
+    def _parse_repository(self, repo_data: Dict) -> Document:
+        """Transform repository API response into a single-chunk document."""
+        content = self._build_repo_content(repo_data)
         metadata = self._build_repo_metadata(repo_data)
 
         return self._create_document(
@@ -131,60 +529,47 @@ class GitHubScraper(BaseScraper):
             content=content,
             url=repo_data['html_url'],
             published_date=self._parse_iso_date(repo_data['updated_at']),
-            metadata=metadata
+            metadata=metadata,
+            needs_chunking=False
         )
 
     def _build_content(self, parts: List[str]) -> str:
         """Join content parts into a single string."""
         return self.CONTENT_SEPARATOR.join(parts)
 
-    def _parse_iso_date(self, iso_string: str) -> datetime:
-        """Parse ISO 8601 date string to datetime."""
-        return datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
-
-    def _append_optional_field(self, parts: List[str], data: Dict, field: str, label: str = None) -> None:
-        """Append a field to parts list if it exists and is not empty."""
-        if label is None:
-            label = field.title()
-        if data.get(field):
-            parts.append(f"{label}: {data[field]}")
+    # Python 3.11+ parses GitHub's 'Z' suffix natively, so no wrapper is needed
+    _parse_iso_date = staticmethod(datetime.fromisoformat)
 
     def _extract_profile_parts(self, user_data: Dict) -> List[str]:
         """Extract profile content parts."""
-        parts = [
+        return [
             f"Username: {user_data['login']}",
             f"Name: {user_data.get('name') or 'N/A'}",
-        ]
-
-        for field in ['bio', 'company', 'location', 'blog']:
-            self._append_optional_field(parts, user_data, field)
-
-        parts.extend([
+            *(
+                f"{label}: {user_data[field]}"
+                for field, label in self.OPTIONAL_PROFILE_FIELDS
+                if user_data.get(field)
+            ),
             f"Public Repositories: {user_data['public_repos']}",
             f"Followers: {user_data['followers']}",
             f"Following: {user_data['following']}",
             f"Created at: {user_data['created_at']}",
-        ])
-
-        return parts
-
-    def _extract_repo_parts(self, repo_data: Dict) -> List[str]:
-        """Extract repository content parts."""
-        parts = [f"Repository: {repo_data['name']}"]
-
-        for field in ['description']:
-            self._append_optional_field(parts, repo_data, field)
-
-        parts.extend([
-            f"Language: {repo_data.get('language') or 'N/A'}",
-            f"Stars: {repo_data['stargazers_count']}",
-            f"Forks: {repo_data['forks_count']}",
-            f"Open Issues: {repo_data['open_issues_count']}",
-            f"Topics: {', '.join(repo_data.get('topics', []) or [])}",
-            f"URL: {repo_data['html_url']}",
-        ])
+        ]
 
-        return parts
+    def _build_repo_content(self, repo_data: Dict) -> str:
+        """Build repository content in one formatting pass, without a list of parts to join."""
+        sep = self.CONTENT_SEPARATOR
+        description = repo_data.get('description')
+        description_part = f"Description: {description}{sep}" if description else ""
+        return (
+            f"Repository: {repo_data['name']}{sep}{description_part}"
+            f"Language: {repo_data.get('language') or 'N/A'}{sep}"
+            f"Stars: {repo_data['stargazers_count']}{sep}"
+            f"Forks: {repo_data['forks_count']}{sep}"
+            f"Open Issues: {repo_data['open_issues_count']}{sep}"
+            f"Topics: {', '.join(repo_data.get('topics') or ())}{sep}"
+            f"URL: {repo_data['html_url']}"
+        )
 
     def _build_profile_metadata(self, user_data: Dict) -> Dict:
         """Build metadata dictionary for user profile."""
@@ -199,10 +584,12 @@ class GitHubScraper(BaseScraper):
 
     def _build_repo_metadata(self, repo_data: Dict) -> Dict:
         """Build metadata dictionary for repository."""
+        # Languages come from a small set but arrive as fresh strings per repo
+        language = repo_data.get('language')
         return {
             'type': 'repository',
             'repo_name': repo_data['name'],
-            'language': repo_data.get('language'),
+            'language': intern(language) if language else language,
             'stars': repo_data['stargazers_count'],
             'forks': repo_data['forks_count'],
             'is_fork': repo_data['fork'],
@@ -1,6 +1,6 @@
 """Registry mapping source names to their scraper classes and configuration keys."""
 
-from ingestion.scrapers import *
+from importlib import import_module
 
 
 class SourceRegistry:
@@ -12,21 +12,26 @@ class SourceRegistry:
     Attributes:
         SOURCES (dict[str, dict]): Maps source names to a config dict with keys:
             - ``"env_var"`` (str): The environment variable used to configure the source.
-            - ``"scraper_class"`` (type): The scraper class for the source.
+            - ``"scraper_module"`` (str): The module defining the scraper class.
+            - ``"scraper_class"`` (str): The name of the scraper class, imported
+              only when the source is scraped.
     """
 
     SOURCES_MAPPING = {
         "medium": {
             "env_var": "MEDIUM_USERNAME",
-            "scraper_class": MediumScraper,
+            "scraper_module": "ingestion.scrapers.medium",
+            "scraper_class": "MediumScraper",
         },
         "github": {
             "env_var": "GITHUB_USERNAME",
-            "scraper_class": GitHubScraper,
+            "scraper_module": "ingestion.scrapers.github",
+            "scraper_class": "GitHubScraper",
         },
         "resume": {
             "env_var": "RESUME_URL",
-            "scraper_class": ResumeScraper,
+            "scraper_module": "ingestion.scrapers.resume",
+            "scraper_class": "ResumeScraper",
         },
     }
 
@@ -54,7 +59,8 @@ class SourceRegistry:
     def get_scraper_class(source_name):
         """Return the scraper class associated with the given source name.
 
-        Performs the lookup at call time so that mocks applied via
+        Imports the scraper's module at call time, so only sources that are
+        actually scraped pay for their dependencies, and mocks applied via
         ``unittest.mock.patch`` are respected in tests.
 
         Args:
@@ -66,6 +72,6 @@ class SourceRegistry:
         Raises:
             KeyError: If ``source_name`` does not match a registered source.
         """
-
-        return SourceRegistry.SOURCES_MAPPING[source_name]["scraper_class"]
+        config = SourceRegistry.SOURCES_MAPPING[source_name]
+        return getattr(import_module(config["scraper_module"]), config["scraper_class"])
 
@@ -0,0 +1,100 @@
+"""Query batching module for coalescing concurrent searches into one round-trip."""
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from retrieval.query import QueryEngine
+
+
+class QueryBatcher:
+    """Groups searches that arrive within a short window into a single batched search."""
+
+    def __init__(
+        self,
+        query_engine: QueryEngine,
+        max_batch_size: int = 16,
+        max_wait_seconds: float = 0.005,
+        max_in_flight: int = 2,
+    ):
+        self.query_engine = query_engine
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.max_in_flight = max_in_flight
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        """Queue a search and wait for its batch to complete."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+
+        future = loop.create_future()
+        await self._queue.put((query, top_k, future))
+        # The collector already holds the first query of the batch it is filling
+        if self._queue.qsize() + 1 >= self.max_batch_size:
+            self._batch_full.set()
+        return await future
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create the queue and background worker for the running event loop."""
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._batch_full = asyncio.Event()
+        self._tasks = set()
+        self._spawn(self._collect_batches())
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine as a task, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _collect_batches(self) -> None:
+        """
+        Drain the queue into batches and dispatch them, bounded by max_in_flight.
+
+        Only the wait on the batch-full event is timed. Before Python 3.12,
+        wait_for could cancel a Queue.get that had already dequeued an item,
+        losing that query, so the queue is only read with untimed calls.
+        """
+        while True:
+            batch = [await self._queue.get()]
+
+            self._batch_full.clear()
+            if self._queue.qsize() + 1 < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._slots.acquire()
+            self._spawn(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Run one batched search and resolve each caller's future."""
+        try:
+            queries = [query for query, _, _ in batch]
+            top_ks = [top_k for _, top_k, _ in batch]
+            results = await self._search(queries, top_ks)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def _search(self, queries: List[str], top_ks: List[int]) -> List[List[Dict]]:
+        """Search a batch, skipping the batch API when only one query is waiting."""
+        if len(queries) == 1:
+            return [await self.query_engine.asearch(queries[0], top_k=top_ks[0])]
+        return await self.query_engine.asearch_batch(queries, top_ks)
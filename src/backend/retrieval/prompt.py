@@ -1,60 +1,183 @@
 """Prompt building module for generating LLM responses."""
-from typing import Dict, Generator, List
+import hashlib
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from typing import AsyncGenerator, Dict, Generator, List
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
 
 
 class PromptBuilder:
     """Builds prompts and generates answers using LLM."""
 
-    def __init__(self, openai_api_key: str, model: str = "gpt-4o-mini"):
+    CONTEXT_CACHE_SIZE = 1024
+    SOURCE_FIELDS = itemgetter('title', 'source', 'content')
+    # Returned without calling the LLM when retrieval found nothing to answer from
+    NO_CONTEXT_ANSWER = "I do not know Jason well enough to answer that question."
+    # Roughly 3000 prompt tokens; chunks are sized in words, so the budget is too
+    MAX_CONTEXT_WORDS = 2250
+    # Identical for every request, so the message is built once and shared
+    SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": (
+            "You are a helpful assistant that answers questions"
+            "based on what you know about Jason."
+        ),
+    }
+
+    def __init__(
+        self,
+        openai_api_key: str,
+        model: str = "gpt-4o-mini",
+        max_context_words: int = MAX_CONTEXT_WORDS,
+    ):
         self.client = OpenAI(api_key=openai_api_key)
+        # HTTP/2 multiplexes concurrent completions over one kept-alive connection
+        self.aclient = AsyncOpenAI(
+            api_key=openai_api_key, http_client=DefaultAsyncHttpxClient(http2=True)
+        )
         self.model = model
+        self.max_context_words = max_context_words
+        self._context_cache: OrderedDict = OrderedDict()
+        self._context_cache_lock = threading.Lock()
 
-    def build_context(self, documents: List[Dict]) -> str:
-        """Build context string from retrieved documents."""
-        context_parts = []
+    async def aclose(self):
+        """Close the async OpenAI client's connections."""
+        await self.aclient.close()
 
-        for i, doc in enumerate(documents, 1):
-            context_parts.append(
-                f"[Source {i}] {doc['title']} ({doc['source']})\n"
-                f"{doc['content']}\n"
-            )
+    def build_context(self, documents: List[Dict]) -> str:
+        """
+        Build context string from retrieved documents.
+
+        Documents arrive most relevant first and are kept, in that order, until
+        max_context_words is reached; the document crossing the budget is cut
+        short. The kept documents are then ordered by id so the same set always
+        renders the same context, and rendered contexts are reused across requests.
+        Cached contexts are keyed by the rendered fields as well as the ids, since
+        re-ingesting a changed document keeps its deterministic id.
+        """
+        documents = self._fit_to_budget(documents)
+
+        if documents and all('id' in doc for doc in documents):
+            documents = sorted(documents, key=lambda doc: str(doc['id']))
+            cache_key = tuple((str(doc['id']), *self.SOURCE_FIELDS(doc)) for doc in documents)
+        else:
+            cache_key = None
+
+        if cache_key is not None:
+            with self._context_cache_lock:
+                if cache_key in self._context_cache:
+                    self._context_cache.move_to_end(cache_key)
+                    return self._context_cache[cache_key]
+
+        context = "\n".join([
+            f"[Source {i}] {title} ({source})\n{content}\n"
+            for i, (title, source, content) in enumerate(map(self.SOURCE_FIELDS, documents), 1)
+        ])
+
+        if cache_key is not None:
+            with self._context_cache_lock:
+                self._context_cache[cache_key] = context
+                if len(self._context_cache) > self.CONTEXT_CACHE_SIZE:
+                    self._context_cache.popitem(last=False)
+
+        return context
+
+    def _fit_to_budget(self, documents: List[Dict]) -> List[Dict]:
+        """
+        Keep the leading documents whose content fits within max_context_words.
 
-        return "\n".join(context_parts)
+        The document crossing the budget is kept with its content truncated.
+        """
+        fitted = []
+        remaining = self.max_context_words
+        for doc in documents:
+            words = doc['content'].split()
+            if len(words) <= remaining:
+                fitted.append(doc)
+                remaining -= len(words)
+                continue
+            if remaining:
+                fitted.append({**doc, 'content': ' '.join(words[:remaining])})
+            break
+        return fitted
 
     def generate_answer(self, question: str, context: str) -> str:
         """Generate answer using OpenAI API with retrieved context."""
-        prompt = f"""You are an AI assistant answering questions based on Jason's
-writing and profile. The following is what you know about him, use it to answer the question.
-If the answer is not in what you know about him, say that you do not know him well enough
-to answer the question.
-
-What I know about Jason:
-{context}
-
-Question: {question}
+        if not context:
+            return self.NO_CONTEXT_ANSWER
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(question, context),
+            temperature=0.7,
+            max_tokens=500,
+            prompt_cache_key=self._prompt_cache_key(context)
+        )
 
-Answer:"""
+        return response.choices[0].message.content
 
-        system_message = (
-            "You are a helpful assistant that answers questions"
-            "based on what you know about Jason."
-        )
-        response = self.client.chat.completions.create(
+    async def agenerate_answer(self, question: str, context: str) -> str:
+        """Generate answer using OpenAI API with retrieved context, without blocking the event loop."""
+        if not context:
+            return self.NO_CONTEXT_ANSWER
+        response = await self.aclient.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
+            messages=self._build_messages(question, context),
             temperature=0.7,
-            max_tokens=500
+            max_tokens=500,
+            prompt_cache_key=self._prompt_cache_key(context)
         )
 
         return response.choices[0].message.content
 
     def generate_answer_stream(self, question: str, context: str) -> Generator[str, None, None]:
         """Generate answer using streaming, yielding text chunks as they arrive."""
+        if not context:
+            yield self.NO_CONTEXT_ANSWER
+            return
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(question, context),
+            temperature=0.7,
+            max_tokens=500,
+            prompt_cache_key=self._prompt_cache_key(context),
+            stream=True
+        )
+
+        for chunk in stream:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    async def agenerate_answer_stream(
+        self, question: str, context: str
+    ) -> AsyncGenerator[str, None]:
+        """Generate answer using streaming, without blocking the event loop."""
+        if not context:
+            yield self.NO_CONTEXT_ANSWER
+            return
+        stream = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(question, context),
+            temperature=0.7,
+            max_tokens=500,
+            prompt_cache_key=self._prompt_cache_key(context),
+            stream=True
+        )
+
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    def _build_messages(self, question: str, context: str) -> List[Dict]:
+        """
+        Build chat messages with the stable instructions and context ahead of the question.
+
+        Keeping the question last lets requests that retrieve the same documents
+        share a byte-identical prompt prefix, which the LLM provider can cache.
+        """
         prompt = f"""You are an AI assistant answering questions based on Jason's
 writing and profile. The following is what you know about him, use it to answer the question.
 If the answer is not in what you know about him, say that you do not know him well enough
@@ -67,25 +190,12 @@ Question: {question}
 
 Answer:"""
 
-        system_message = (
-            "You are a helpful assistant that answers questions"
-            "based on what you know about Jason."
-        )
-        stream = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500,
-            stream=True
-        )
+        return [self.SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
 
-        for chunk in stream:
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+    @staticmethod
+    def _prompt_cache_key(context: str) -> str:
+        """Derive a prompt cache routing key from the retrieved context."""
+        return hashlib.sha256(context.encode()).hexdigest()[:32]
 
     def answer_question(self, question: str, retrieved_docs: List[Dict]) -> Dict:
         """
@@ -108,3 +218,22 @@ Answer:"""
             'answer': answer,
             'sources': retrieved_docs
         }
+
+    async def aanswer_question(self, question: str, retrieved_docs: List[Dict]) -> Dict:
+        """
+        Answer a question using retrieved documents, without blocking the event loop.
+
+        Args:
+            question: User's question
+            retrieved_docs: Documents retrieved from vector search
+
+        Returns:
+            Dict with 'answer' and 'sources'
+        """
+        context = self.build_context(retrieved_docs)
+        answer = await self.agenerate_answer(question, context)
+
+        return {
+            'answer': answer,
+            'sources': retrieved_docs
+        }
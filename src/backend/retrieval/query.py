@@ -1,16 +1,84 @@
 """Query engine module for semantic search over documents."""
-from typing import Dict, List
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+
+import numpy as np
 
 from config.database import VectorDatabase
 from ingestion.embedder import Embedder
 
 
-class QueryEngine:  # pylint: disable=too-few-public-methods
+class QueryEngine:
     """Handles query embedding and vector search."""
 
+    EMBEDDING_CACHE_SIZE = 4096
+
     def __init__(self, embedder: Embedder, vector_db: VectorDatabase):
         self.embedder = embedder
         self.vector_db = vector_db
+        self._embedding_cache: OrderedDict = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing the embedding of an earlier equivalent query."""
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed queries in one model call, skipping any whose embedding is cached."""
+        keys = [self._normalize_query(query) for query in queries]
+        embeddings = [self._get_cached_embedding(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            if len(missing) == 1:
+                fresh = [self.embedder.embed_text(queries[missing[0]])]
+            else:
+                fresh = self.embedder.embed_batch([queries[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                self._cache_embedding(keys[i], embedding)
+        return np.stack(embeddings)
+
+    async def aembed_query(self, query: str) -> np.ndarray:
+        """Embed a query without blocking the event loop."""
+        return (await self.aembed_queries([query]))[0]
+
+    async def aembed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed queries without blocking the event loop.
+
+        Cached embeddings are returned directly; the model only runs, in a
+        worker thread, when at least one query has not been embedded before.
+        """
+        cached = [self._get_cached_embedding(self._normalize_query(query)) for query in queries]
+        if all(embedding is not None for embedding in cached):
+            return np.stack(cached)
+        return await asyncio.to_thread(self.embed_queries, queries)
+
+    def clear_embedding_cache(self) -> None:
+        """Forget all cached query embeddings."""
+        with self._embedding_cache_lock:
+            self._embedding_cache.clear()
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Key queries by text, ignoring case and whitespace differences."""
+        return " ".join(query.lower().split())
+
+    def _get_cached_embedding(self, key: str) -> Optional[np.ndarray]:
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+            return embedding
+
+    def _cache_embedding(self, key: str, embedding: np.ndarray) -> None:
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
 
     def search(self, query: str, top_k: int = 5) -> List[Dict]:
         """
@@ -24,9 +92,69 @@ class QueryEngine:  # pylint: disable=too-few-public-methods
             List of similar documents with metadata and similarity scores
         """
         # Embed the query
-        query_embedding = self.embedder.embed_text(query)
+        query_embedding = self.embed_query(query)
 
         # Search vector database
         results = self.vector_db.search_similar(query_embedding, top_k=top_k)
 
         return results
+
+    def search_batch(self, queries: List[str], top_ks: Union[int, List[int]]) -> List[List[Dict]]:
+        """
+        Search for similar documents for several queries at once.
+
+        Args:
+            queries: User questions
+            top_ks: Number of similar documents to retrieve, either one value
+                shared by every question or one value per question
+
+        Returns:
+            One list of similar documents per query, in the same order as queries
+        """
+        top_ks = self._expand_top_ks(queries, top_ks)
+
+        # Embed all queries in a single model call
+        query_embeddings = self.embed_queries(queries)
+
+        # Search vector database in a single round-trip
+        return self.vector_db.search_similar_batch(query_embeddings, top_ks=top_ks)
+
+    async def asearch(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        Search for similar documents without blocking the event loop.
+
+        Embedding is CPU-bound and runs in a worker thread unless the query's
+        embedding is cached; the vector search uses the async Qdrant client.
+
+        Args:
+            query: User's question
+            top_k: Number of similar documents to retrieve
+
+        Returns:
+            List of similar documents with metadata and similarity scores
+        """
+        query_embedding = await self.aembed_query(query)
+        return await self.vector_db.asearch_similar(query_embedding, top_k=top_k)
+
+    async def asearch_batch(self, queries: List[str], top_ks: Union[int, List[int]]) -> List[List[Dict]]:
+        """
+        Search for similar documents for several queries without blocking the event loop.
+
+        Args:
+            queries: User questions
+            top_ks: Number of similar documents to retrieve, either one value
+                shared by every question or one value per question
+
+        Returns:
+            One list of similar documents per query, in the same order as queries
+        """
+        top_ks = self._expand_top_ks(queries, top_ks)
+        query_embeddings = await self.aembed_queries(queries)
+        return await self.vector_db.asearch_similar_batch(query_embeddings, top_ks=top_ks)
+
+    @staticmethod
+    def _expand_top_ks(queries: List[str], top_ks: Union[int, List[int]]) -> List[int]:
+        """Broadcast a shared top_k to one value per query."""
+        if isinstance(top_ks, int):
+            return [top_ks] * len(queries)
+        return top_ks
@@ -0,0 +1,161 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from api.cache import ResponseCache, SemanticResponseCache
+
+
+class TestResponseCache:
+    """Test suite for the ResponseCache class."""
+
+    def test_get_returns_none_when_missing(self):
+        """Test get returns None for an unknown question."""
+        cache = ResponseCache()
+        assert cache.get("Unknown question", 5) is None
+
+    def test_set_and_get_round_trip(self):
+        """Test a stored response is returned on lookup."""
+        cache = ResponseCache()
+        response = {"answer": "Answer", "sources": []}
+
+        cache.set("Who is Jason?", 5, response)
+
+        assert cache.get("Who is Jason?", 5) == response
+
+    def test_key_is_normalized(self):
+        """Test case and surrounding whitespace do not affect the key."""
+        cache = ResponseCache()
+        cache.set("Who is Jason?", 5, {"answer": "Answer", "sources": []})
+
+        assert cache.get("  who is jason?  ", 5) is not None
+
+    def test_key_includes_top_k(self):
+        """Test different top_k values are cached separately."""
+        cache = ResponseCache()
+        cache.set("Who is Jason?", 5, {"answer": "Answer", "sources": []})
+
+        assert cache.get("Who is Jason?", 10) is None
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries older than the TTL are not returned."""
+        cache = ResponseCache(ttl_seconds=60)
+        with patch("api.cache.time.time", return_value=1000.0):
+            cache.set("Who is Jason?", 5, {"answer": "Answer", "sources": []})
+
+        with patch("api.cache.time.time", return_value=1060.0):
+            assert cache.get("Who is Jason?", 5) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = ResponseCache(max_size=2)
+        cache.set("first", 5, {"answer": "1", "sources": []})
+        cache.set("second", 5, {"answer": "2", "sources": []})
+        cache.get("first", 5)
+        cache.set("third", 5, {"answer": "3", "sources": []})
+
+        assert cache.get("second", 5) is None
+        assert cache.get("first", 5) is not None
+        assert cache.get("third", 5) is not None
+
+    def test_clear(self):
+        """Test clear removes all entries."""
+        cache = ResponseCache()
+        cache.set("Who is Jason?", 5, {"answer": "Answer", "sources": []})
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+    def test_counts_hits_and_misses(self):
+        """Test lookups are counted as hits or misses, including expired entries."""
+        cache = ResponseCache(ttl_seconds=60)
+        with patch("api.cache.time.time", return_value=1000.0):
+            cache.set("Who is Jason?", 5, {"answer": "Answer", "sources": []})
+            cache.get("Who is Jason?", 5)
+            cache.get("Unknown question", 5)
+        with patch("api.cache.time.time", return_value=1060.0):
+            cache.get("Who is Jason?", 5)
+
+        assert cache.stats() == {"size": 0, "hits": 1, "misses": 2}
+
+
+class TestSemanticResponseCache:
+    """Test suite for the SemanticResponseCache class."""
+
+    def test_get_returns_none_when_empty(self):
+        """Test get returns None before anything is cached."""
+        cache = SemanticResponseCache()
+        assert cache.get(np.ones(4), 5) is None
+
+    def test_similar_embedding_hits(self):
+        """Test an embedding above the similarity threshold returns the cached response."""
+        cache = SemanticResponseCache(similarity_threshold=0.95)
+        response = {"answer": "Answer", "sources": []}
+        cache.set(np.array([1.0, 0.0, 0.0, 0.0]), 5, response)
+
+        assert cache.get(np.array([2.0, 0.1, 0.0, 0.0]), 5) == response
+
+    def test_dissimilar_embedding_misses(self):
+        """Test an embedding below the similarity threshold is not matched."""
+        cache = SemanticResponseCache(similarity_threshold=0.95)
+        cache.set(np.array([1.0, 0.0, 0.0, 0.0]), 5, {"answer": "Answer", "sources": []})
+
+        assert cache.get(np.array([1.0, 1.0, 0.0, 0.0]), 5) is None
+
+    def test_returns_most_similar_response(self):
+        """Test the closest cached question wins when several clear the threshold."""
+        cache = SemanticResponseCache(similarity_threshold=0.9)
+        cache.set(np.array([1.0, 0.3, 0.0]), 5, {"answer": "Far", "sources": []})
+        cache.set(np.array([1.0, 0.1, 0.0]), 5, {"answer": "Near", "sources": []})
+
+        assert cache.get(np.array([1.0, 0.0, 0.0]), 5)["answer"] == "Near"
+
+    def test_top_k_must_match(self):
+        """Test responses retrieved with a different top_k are not reused."""
+        cache = SemanticResponseCache()
+        cache.set(np.ones(4), 5, {"answer": "Answer", "sources": []})
+
+        assert cache.get(np.ones(4), 10) is None
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries older than the TTL are evicted on lookup."""
+        cache = SemanticResponseCache(ttl_seconds=10)
+        with patch("api.cache.time.time", return_value=1000.0):
+            cache.set(np.ones(4), 5, {"answer": "Answer", "sources": []})
+        with patch("api.cache.time.time", return_value=1010.0):
+            assert cache.get(np.ones(4), 5) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache never grows past max_size."""
+        cache = SemanticResponseCache(max_size=2)
+        for index in range(3):
+            embedding = np.zeros(3)
+            embedding[index] = 1.0
+            cache.set(embedding, 5, {"answer": str(index), "sources": []})
+
+        assert len(cache) == 2
+        assert cache.get(np.array([1.0, 0.0, 0.0]), 5) is None
+
+    def test_expired_slots_are_reused(self):
+        """Test a slot freed by expiry is filled by the next set."""
+        cache = SemanticResponseCache(ttl_seconds=10, max_size=1)
+        with patch("api.cache.time.time", return_value=1000.0):
+            cache.set(np.array([1.0, 0.0]), 5, {"answer": "Old", "sources": []})
+        with patch("api.cache.time.time", return_value=1010.0):
+            assert cache.get(np.array([1.0, 0.0]), 5) is None
+            cache.set(np.array([0.0, 1.0]), 5, {"answer": "New", "sources": []})
+            assert cache.get(np.array([0.0, 1.0]), 5)["answer"] == "New"
+
+    def test_counts_hits_and_misses(self):
+        """Test lookups are counted as hits or misses and clear resets the counts."""
+        cache = SemanticResponseCache(similarity_threshold=0.95)
+        cache.set(np.array([1.0, 0.0, 0.0]), 5, {"answer": "Answer", "sources": []})
+        cache.get(np.array([1.0, 0.0, 0.0]), 5)
+        cache.get(np.array([0.0, 1.0, 0.0]), 5)
+        cache.get(np.array([1.0, 0.0, 0.0]), 10)
+
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 2}
+        cache.clear()
+        assert cache.stats() == {"size": 0, "hits": 0, "misses": 0}
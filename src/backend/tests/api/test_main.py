@@ -1,19 +1,62 @@
+import hashlib
+import json
+
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch, MagicMock
-from api.main import app
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from api.main import app, embedder, query_batcher, query_engine, response_cache, semantic_cache
+
+
+def _make_source(index):
+    """Build a source dict shaped like VectorDatabase search results."""
+    return {
+        "id": f"id-{index}",
+        "title": f"Doc {index}",
+        "content": f"Document {index} content",
+        "source": "medium",
+        "url": f"https://example.com/{index}",
+        "published_date": "2024-01-01T00:00:00",
+        "similarity": 0.9,
+    }
 
 
-@pytest.fixture
+def _fake_embedding(text):
+    """Embed text as a deterministic vector that differs between distinct questions."""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "big")
+    return np.random.default_rng(seed).standard_normal(384)
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Ensure cached responses do not leak between tests."""
+    response_cache.clear()
+    semantic_cache.clear()
+    yield
+    response_cache.clear()
+    semantic_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_embed_text():
+    """Embed questions without loading the embedding model."""
+    query_engine.clear_embedding_cache()
+    with patch.object(embedder, "embed_text", side_effect=_fake_embedding) as mock:
+        yield mock
+    query_engine.clear_embedding_cache()
+
+
+@pytest.fixture(scope="module")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create one test client, running the app's lifespan once for the whole module."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
 def mock_query_engine():
-    """Mock the query engine."""
-    with patch("api.main.query_engine") as mock:
+    """Mock the query engine used by the query batcher."""
+    with patch.object(query_batcher, "query_engine", new_callable=AsyncMock) as mock:
         yield mock
 
 
@@ -21,6 +64,7 @@ def mock_query_engine():
 def mock_prompt_builder():
     """Mock the prompt builder."""
     with patch("api.main.prompt_builder") as mock:
+        mock.aanswer_question = AsyncMock()
         yield mock
 
 
@@ -41,18 +85,15 @@ def test_health(client):
 def test_query_success(client, mock_query_engine, mock_prompt_builder):
     """Test successful query."""
     # Mock retrieved documents
-    mock_retrieved_docs = [
-        {"content": "Document 1 content", "metadata": {"source": "doc1.txt"}},
-        {"content": "Document 2 content", "metadata": {"source": "doc2.txt"}}
-    ]
-    mock_query_engine.search.return_value = mock_retrieved_docs
+    mock_retrieved_docs = [_make_source(1), _make_source(2)]
+    mock_query_engine.asearch.return_value = mock_retrieved_docs
 
     # Mock answer
     mock_answer = {
         "answer": "This is the answer to the question.",
-        "sources": [{"source": "doc1.txt"}, {"source": "doc2.txt"}]
+        "sources": mock_retrieved_docs
     }
-    mock_prompt_builder.answer_question.return_value = mock_answer
+    mock_prompt_builder.aanswer_question.return_value = mock_answer
 
     # Make request
     response = client.post("/query", json={"question": "What is the answer?"})
@@ -63,16 +104,16 @@ def test_query_success(client, mock_query_engine, mock_prompt_builder):
     assert len(data["sources"]) == 2
 
     # Verify mocks were called correctly
-    mock_query_engine.search.assert_called_once_with("What is the answer?", top_k=5)
-    mock_prompt_builder.answer_question.assert_called_once_with(
+    mock_query_engine.asearch.assert_called_once_with("What is the answer?", top_k=5)
+    mock_prompt_builder.aanswer_question.assert_awaited_once_with(
         "What is the answer?", mock_retrieved_docs
     )
 
 
 def test_query_with_custom_top_k(client, mock_query_engine, mock_prompt_builder):
     """Test query with custom top_k parameter."""
-    mock_query_engine.search.return_value = []
-    mock_prompt_builder.answer_question.return_value = {
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {
         "answer": "Answer",
         "sources": []
     }
@@ -80,7 +121,91 @@ def test_query_with_custom_top_k(client, mock_query_engine, mock_prompt_builder)
     response = client.post("/query", json={"question": "Test question", "top_k": 10})
 
     assert response.status_code == 200
-    mock_query_engine.search.assert_called_once_with("Test question", top_k=10)
+    mock_query_engine.asearch.assert_called_once_with("Test question", top_k=10)
+
+
+def test_query_cache_hit_skips_pipeline(client, mock_query_engine, mock_prompt_builder):
+    """Test that equivalent questions are served from the response cache."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {
+        "answer": "Cached answer",
+        "sources": []
+    }
+
+    first = client.post("/query", json={"question": "What is RAG?"})
+    second = client.post("/query", json={"question": "  what is rag?"})
+
+    assert first.json() == second.json()
+    mock_query_engine.asearch.assert_called_once()
+    mock_prompt_builder.aanswer_question.assert_called_once()
+
+
+def test_query_semantic_cache_hit_skips_pipeline(client, mock_query_engine, mock_prompt_builder, mock_embed_text):
+    """Test that a rephrased question with a near-identical embedding reuses the cached response."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {"answer": "Cached answer", "sources": []}
+    mock_embed_text.side_effect = lambda text: np.ones(384)
+
+    first = client.post("/query", json={"question": "Who is Jason?"})
+    second = client.post("/query", json={"question": "Tell me about Jason"})
+
+    assert first.json() == second.json()
+    mock_query_engine.asearch.assert_called_once()
+    mock_prompt_builder.aanswer_question.assert_awaited_once()
+
+
+def test_query_semantic_cache_miss_runs_pipeline(client, mock_query_engine, mock_prompt_builder):
+    """Test that unrelated questions are each answered by the pipeline."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {"answer": "Answer", "sources": []}
+
+    client.post("/query", json={"question": "Who is Jason?"})
+    client.post("/query", json={"question": "What languages does Jason use?"})
+
+    assert mock_prompt_builder.aanswer_question.await_count == 2
+
+
+def test_query_repeated_after_ttl_runs_pipeline(client, mock_query_engine, mock_prompt_builder):
+    """Test a question asked again after the exact-match TTL is answered afresh, not from either tier."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {"answer": "Answer", "sources": []}
+
+    with patch("api.cache.time.time", return_value=1000.0):
+        client.post("/query", json={"question": "Who is Jason?"})
+    with patch("api.cache.time.time", return_value=1000.0 + response_cache.ttl_seconds):
+        client.post("/query", json={"question": "Who is Jason?"})
+
+    assert mock_prompt_builder.aanswer_question.await_count == 2
+
+
+def test_query_semantic_cache_hit_is_not_copied_to_exact_tier(
+    client, mock_query_engine, mock_prompt_builder, mock_embed_text
+):
+    """Test a rephrasing served by the semantic tier does not get its own exact-match entry."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {"answer": "Answer", "sources": []}
+    mock_embed_text.side_effect = lambda text: np.ones(384)
+
+    client.post("/query", json={"question": "Who is Jason?"})
+    client.post("/query", json={"question": "Tell me about Jason"})
+
+    assert response_cache.get("Tell me about Jason", 5) is None
+
+
+def test_cache_stats_reports_both_tiers(client, mock_query_engine, mock_prompt_builder, mock_embed_text):
+    """Test the stats endpoint counts exact and semantic cache hits and misses."""
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.return_value = {"answer": "Answer", "sources": []}
+    mock_embed_text.side_effect = lambda text: np.ones(384)
+
+    client.post("/query", json={"question": "Who is Jason?"})
+    client.post("/query", json={"question": "Tell me about Jason"})
+    client.post("/query", json={"question": "Who is Jason?"})
+
+    assert client.get("/cache/stats").json() == {
+        "exact": {"size": 1, "hits": 1, "misses": 2},
+        "semantic": {"size": 1, "hits": 1, "misses": 1},
+    }
 
 
 def test_query_missing_question(client):
@@ -95,9 +220,15 @@ def test_query_invalid_top_k(client):
     assert response.status_code == 422  # Validation error
 
 
+def test_query_rejects_unknown_fields(client):
+    """Test query rejects request fields it does not understand."""
+    response = client.post("/query", json={"question": "Test", "topk": 3})
+    assert response.status_code == 422
+
+
 def test_query_search_error(client, mock_query_engine, mock_prompt_builder):
     """Test query when search raises an exception."""
-    mock_query_engine.search.side_effect = Exception("Database error")
+    mock_query_engine.asearch.side_effect = Exception("Database error")
 
     response = client.post("/query", json={"question": "Test question"})
 
@@ -107,10 +238,72 @@ def test_query_search_error(client, mock_query_engine, mock_prompt_builder):
 
 def test_query_answer_generation_error(client, mock_query_engine, mock_prompt_builder):
     """Test query when answer generation raises an exception."""
-    mock_query_engine.search.return_value = []
-    mock_prompt_builder.answer_question.side_effect = Exception("LLM error")
+    mock_query_engine.asearch.return_value = []
+    mock_prompt_builder.aanswer_question.side_effect = Exception("LLM error")
 
     response = client.post("/query", json={"question": "Test question"})
 
     assert response.status_code == 500
     assert "LLM error" in response.json()["detail"]
+
+
+async def _async_iter(items):
+    for item in items:
+        yield item
+
+
+def _parse_sse_events(response):
+    """Parse the JSON payloads out of an SSE response body."""
+    return [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_query_stream_success(client, mock_query_engine, mock_prompt_builder):
+    """Test streaming query emits sources then answer chunks."""
+    mock_retrieved_docs = [_make_source(1)]
+    mock_query_engine.asearch.return_value = mock_retrieved_docs
+    mock_prompt_builder.build_context.return_value = "context"
+    mock_prompt_builder.agenerate_answer_stream = Mock(
+        return_value=_async_iter(["Hello", " world"])
+    )
+
+    response = client.post("/query/stream", json={"question": "Who is Jason?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _parse_sse_events(response) == [
+        {"type": "sources", "sources": mock_retrieved_docs},
+        {"type": "text", "content": "Hello"},
+        {"type": "text", "content": " world"},
+    ]
+    mock_prompt_builder.agenerate_answer_stream.assert_called_once_with("Who is Jason?", "context")
+
+
+def test_query_stream_search_error(client, mock_query_engine, mock_prompt_builder):
+    """Test streaming query emits an error event when search fails."""
+    mock_query_engine.asearch.side_effect = Exception("Database error")
+
+    response = client.post("/query/stream", json={"question": "Who is Jason?"})
+
+    assert _parse_sse_events(response) == [{"type": "error", "detail": "Database error"}]
+
+
+def test_query_stream_answer_error(client, mock_query_engine, mock_prompt_builder):
+    """Test streaming query emits an error event when the LLM fails mid-answer."""
+    async def failing_stream():
+        yield "Partial"
+        raise Exception("LLM timeout")
+
+    mock_query_engine.asearch.return_value = [_make_source(1)]
+    mock_prompt_builder.build_context.return_value = "context"
+    mock_prompt_builder.agenerate_answer_stream = Mock(return_value=failing_stream())
+
+    response = client.post("/query/stream", json={"question": "Who is Jason?"})
+
+    assert _parse_sse_events(response)[1:] == [
+        {"type": "text", "content": "Partial"},
+        {"type": "error", "detail": "LLM timeout"},
+    ]
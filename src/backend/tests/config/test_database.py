@@ -13,53 +13,122 @@ class TestVectorDatabase:
         vector_db.client = MagicMock()
         return vector_db
 
+    @pytest.fixture
+    def db_with_collection(self, setup_mock_database):
+        """Fixture to provide a mock VectorDatabase whose collection exists but holds no matching points."""
+        setup_mock_database.client.collection_exists.return_value = True
+        setup_mock_database.client.scroll.return_value = ([], None)
+        return setup_mock_database
+
     def test_connect_creates_qdrant_client(self):
-        """Test that connect initializes the Qdrant client."""
-        with patch("config.database.QdrantClient") as mock_qdrant_client:
+        """Test that connect initializes the sync and async Qdrant clients over gRPC."""
+        with patch("config.database.QdrantClient") as mock_qdrant_client, \
+                patch("config.database.AsyncQdrantClient") as mock_async_qdrant_client:
             vector_db = VectorDatabase()
             client = vector_db.connect()
             assert vector_db.client == client
-            mock_qdrant_client.assert_called_once_with(host=vector_db.host, port=vector_db.port)
+            assert vector_db.aclient == mock_async_qdrant_client.return_value
+            expected_kwargs = {
+                "host": vector_db.host,
+                "port": vector_db.port,
+                "grpc_port": vector_db.grpc_port,
+                "prefer_grpc": True,
+            }
+            mock_qdrant_client.assert_called_once_with(**expected_kwargs)
+            mock_async_qdrant_client.assert_called_once_with(**expected_kwargs)
 
     def test_setup_database_behavior(self, setup_mock_database):
         """Test setup_database creates collection if not exists, skips otherwise."""
         vector_db = setup_mock_database
 
         # Test when collection does not exist
-        vector_db.client.get_collections.return_value.collections = []
+        vector_db.client.collection_exists.return_value = False
         vector_db.setup_database(embedding_dim=384)
         vector_db.client.create_collection.assert_called_once()
+        create_kwargs = vector_db.client.create_collection.call_args.kwargs
+        assert create_kwargs["quantization_config"] == vector_db.QUANTIZATION_CONFIG
+        assert create_kwargs["hnsw_config"] == vector_db.HNSW_CONFIG
+        assert create_kwargs["vectors_config"].datatype == vector_db.VECTOR_DATATYPE
         vector_db.client.create_collection.reset_mock()
 
         # Test when collection already exists
-        mock_collection = MagicMock()
-        mock_collection.name = vector_db.collection_name
-        vector_db.client.get_collections.return_value.collections = [mock_collection]
+        vector_db._collection_known_to_exist = False
+        vector_db.client.collection_exists.return_value = True
         vector_db.setup_database(embedding_dim=384)
         vector_db.client.create_collection.assert_not_called()
 
-    def test_insert_documents_calls_upsert(self, setup_mock_database):
-        """Test insert_documents calls upsert with the correct points."""
+    def test_insert_documents_uploads_float32_matrix(self, setup_mock_database):
+        """Test insert_documents uploads embeddings as one float32 matrix with payloads."""
+        import numpy as np
+        from datetime import datetime
+
         vector_db = setup_mock_database
         documents = [
             {
-                "embedding": MagicMock(),
-                "title": "Document Title",
+                "embedding": np.array([0.1, 0.2], dtype=np.float64),
+                "title": f"Document Title {i}",
                 "content": "Document Content",
                 "source": "Document Source",
                 "url": "http://example.com",
-                "published_date": MagicMock(),
-                "chunk_index": 1,
+                "published_date": datetime(2024, 1, 1),
+                "chunk_index": i,
             }
+            for i in range(2)
         ]
 
-        with patch.object(vector_db, "_create_point_from_document", return_value="mock_point") as mock_create_point:
-            vector_db.insert_documents(documents)
-            mock_create_point.assert_called_once_with(documents[0])
-            vector_db.client.upsert.assert_called_once_with(
-                collection_name=vector_db.collection_name,
-                points=["mock_point"],
-            )
+        vector_db.insert_documents(documents)
+
+        call_kwargs = vector_db.client.upload_collection.call_args.kwargs
+        assert call_kwargs["collection_name"] == vector_db.collection_name
+        assert call_kwargs["vectors"].dtype == np.float32
+        assert call_kwargs["vectors"].shape == (2, 2)
+        assert [p["title"] for p in call_kwargs["payload"]] == ["Document Title 0", "Document Title 1"]
+        assert call_kwargs["payload"][0]["published_date"] == "2024-01-01T00:00:00"
+        assert len(set(call_kwargs["ids"])) == 2
+        assert call_kwargs["wait"] is True
+
+    def test_build_payload_accepts_preformatted_date(self, setup_mock_database):
+        """Test payloads keep published_date strings produced by the chunker."""
+        doc = {
+            "title": "Title", "content": "Content", "source": "medium",
+            "url": "http://example.com", "published_date": "2024-01-01T00:00:00",
+            "chunk_index": 0,
+        }
+
+        payload = setup_mock_database._build_payload(doc)
+
+        assert payload["published_date"] == "2024-01-01T00:00:00"
+
+    def test_point_id_is_deterministic(self):
+        """Test the same chunk always maps to the same point id."""
+        doc = {"source": "medium", "url": "http://example.com", "chunk_index": 0}
+
+        assert VectorDatabase._point_id(doc) == VectorDatabase._point_id(dict(doc))
+        assert VectorDatabase._point_id(doc) != VectorDatabase._point_id({**doc, "chunk_index": 1})
+        assert VectorDatabase._point_id(doc) != VectorDatabase._point_id({**doc, "content_hash": "abc"})
+
+    def test_insert_documents_uses_embedding_matrix(self, setup_mock_database):
+        """Test insert_documents uploads a provided embedding matrix as-is."""
+        import numpy as np
+        from datetime import datetime
+
+        vector_db = setup_mock_database
+        documents = [{
+            "title": "Title", "content": "Content", "source": "medium",
+            "url": "http://example.com", "published_date": datetime(2024, 1, 1),
+            "chunk_index": 0,
+        }]
+        embeddings = np.array([[0.1, 0.2]], dtype=np.float32)
+
+        vector_db.insert_documents(documents, embeddings)
+
+        assert vector_db.client.upload_collection.call_args.kwargs["vectors"] is embeddings
+
+    def test_insert_documents_skips_empty_list(self, setup_mock_database):
+        """Test insert_documents does nothing when there are no documents."""
+        vector_db = setup_mock_database
+        vector_db.insert_documents([])
+        vector_db.client.upload_collection.assert_not_called()
 
     def test_search_similar_calls_query_points(self, setup_mock_database):
         """Test search_similar performs query with expected parameters and returns results."""
@@ -77,9 +146,61 @@ class TestVectorDatabase:
             collection_name=vector_db.collection_name,
             query=query_embedding.tolist(),
             limit=5,
+            search_params=vector_db.SEARCH_PARAMS,
+            with_payload=vector_db.SEARCH_PAYLOAD_FIELDS,
         )
         assert results == []
 
+    def test_search_similar_batch_calls_query_batch_points(self, setup_mock_database):
+        """Test search_similar_batch sends one request per query and splits results."""
+        import numpy as np
+
+        vector_db = setup_mock_database
+        query_embeddings = np.array([[0.1, 0.2], [0.3, 0.4]])
+
+        hit = MagicMock(id="1", score=0.9, payload={
+            "title": "Title", "content": "Content", "source": "medium",
+            "url": "http://example.com", "published_date": "2023-01-01T12:00:00",
+        })
+        vector_db.client.query_batch_points.return_value = [
+            MagicMock(points=[hit]),
+            MagicMock(points=[]),
+        ]
+
+        results = vector_db.search_similar_batch(query_embeddings, top_ks=[3, 7])
+
+        call_kwargs = vector_db.client.query_batch_points.call_args.kwargs
+        assert call_kwargs["collection_name"] == vector_db.collection_name
+        assert [request.limit for request in call_kwargs["requests"]] == [3, 7]
+        assert all(
+            request.with_payload == vector_db.SEARCH_PAYLOAD_FIELDS for request in call_kwargs["requests"]
+        )
+        assert len(results) == 2
+        assert results[0][0]["similarity"] == 0.9
+        assert results[1] == []
+
+    def test_asearch_similar_awaits_async_client(self, setup_mock_database):
+        """Test asearch_similar queries through the async client."""
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        vector_db = setup_mock_database
+        vector_db.aclient = AsyncMock()
+        vector_db.aclient.query_points.return_value = MagicMock(points=[])
+        query_embedding = MagicMock()
+
+        results = asyncio.run(vector_db.asearch_similar(query_embedding, top_k=3))
+
+        vector_db.aclient.query_points.assert_awaited_once_with(
+            collection_name=vector_db.collection_name,
+            query=query_embedding.tolist(),
+            limit=3,
+            search_params=vector_db.SEARCH_PARAMS,
+            with_payload=vector_db.SEARCH_PAYLOAD_FIELDS,
+        )
+        vector_db.client.query_points.assert_not_called()
+        assert results == []
+
     def test_get_last_scraped_date_without_client(self):
         """Test get_last_scraped_date returns None when client is None."""
         vector_db = VectorDatabase()
@@ -89,43 +210,27 @@ class TestVectorDatabase:
     def test_get_last_scraped_date_collection_not_exists(self, setup_mock_database):
         """Test get_last_scraped_date returns None when collection doesn't exist."""
         vector_db = setup_mock_database
-        vector_db.client.get_collections.return_value.collections = []
+        vector_db.client.collection_exists.return_value = False
 
         result = vector_db.get_last_scraped_date(source="source_name")
 
         assert result is None
         vector_db.client.scroll.assert_not_called()
 
-    def test_get_last_scraped_date_collection_empty(self, setup_mock_database):
-        """Test get_last_scraped_date returns None when collection is empty."""
-        vector_db = setup_mock_database
-
-        # Mock collection exists
-        mock_collection = MagicMock()
-        mock_collection.name = vector_db.collection_name
-        vector_db.client.get_collections.return_value.collections = [mock_collection]
-
-        # Mock collection is empty
-        vector_db.client.count.return_value.count = 0
+    def test_get_last_scraped_date_no_matching_points(self, db_with_collection):
+        """Test get_last_scraped_date returns None when no documents match the source."""
+        vector_db = db_with_collection
 
         result = vector_db.get_last_scraped_date(source="source_name")
 
         assert result is None
-        vector_db.client.scroll.assert_not_called()
+        vector_db.client.count.assert_not_called()
 
-    def test_get_last_scraped_date_with_results(self, setup_mock_database):
+    def test_get_last_scraped_date_with_results(self, db_with_collection):
         """Test get_last_scraped_date returns the most recent date."""
         from datetime import datetime
 
-        vector_db = setup_mock_database
-
-        # Mock collection exists
-        mock_collection = MagicMock()
-        mock_collection.name = vector_db.collection_name
-        vector_db.client.get_collections.return_value.collections = [mock_collection]
-
-        # Mock collection has documents
-        vector_db.client.count.return_value.count = 10
+        vector_db = db_with_collection
 
         # Mock scroll returns a document
         mock_point = MagicMock(payload={"published_date": "2023-01-01T12:00:00"})
@@ -136,22 +241,71 @@ class TestVectorDatabase:
         assert result == datetime.fromisoformat("2023-01-01T12:00:00")
         vector_db.client.scroll.assert_called_once()
 
-    def test_get_last_scraped_date_no_matching_source(self, setup_mock_database):
-        """Test get_last_scraped_date returns None when no documents match the source."""
-        vector_db = setup_mock_database
+    def test_repeated_lookups_reuse_collection_and_index_checks(self, db_with_collection):
+        """Test collection existence and payload index checks are only made once."""
+        vector_db = db_with_collection
+
+        with patch("config.database.check_payload_index_exists", return_value=True) as mock_check:
+            vector_db.get_last_scraped_date(source="medium")
+            vector_db.get_last_scraped_date(source="github")
+            vector_db.get_content_hash(source="resume")
 
-        # Mock collection exists and has documents
-        mock_collection = MagicMock()
-        mock_collection.name = vector_db.collection_name
-        vector_db.client.get_collections.return_value.collections = [mock_collection]
-        vector_db.client.count.return_value.count = 10
+        vector_db.client.collection_exists.assert_called_once_with(vector_db.collection_name)
+        mock_check.assert_called_once_with(vector_db.client, vector_db.collection_name, "published_date")
+
+    def test_missing_collection_is_rechecked(self, setup_mock_database):
+        """Test a missing collection is not cached, so it is found once created."""
+        vector_db = setup_mock_database
+        vector_db.client.collection_exists.return_value = False
+        vector_db.get_content_hash(source="resume")
 
-        # Mock scroll returns empty results
+        vector_db.client.collection_exists.return_value = True
         vector_db.client.scroll.return_value = ([], None)
+        vector_db.get_content_hash(source="resume")
 
-        result = vector_db.get_last_scraped_date(source="source_name")
+        assert vector_db.client.collection_exists.call_count == 2
 
-        assert result is None
+    def test_get_etags_without_state_collection(self, setup_mock_database):
+        """Test get_etags returns an empty dict before any ETags were stored."""
+        vector_db = setup_mock_database
+        vector_db.client.collection_exists.return_value = False
+
+        assert vector_db.get_etags("github") == {}
+        vector_db.client.scroll.assert_not_called()
+
+    def test_get_etags_pages_through_scrape_state(self, db_with_collection):
+        """Test get_etags collects every stored ETag for the source."""
+        vector_db = db_with_collection
+        first = MagicMock(payload={"url": "https://a", "etag": '"1"'})
+        second = MagicMock(payload={"url": "https://b", "etag": '"2"'})
+        vector_db.client.scroll.side_effect = [([first], "next"), ([second], None)]
+
+        assert vector_db.get_etags("github") == {"https://a": '"1"', "https://b": '"2"'}
+        assert vector_db.client.scroll.call_args_list[1].kwargs["offset"] == "next"
+        assert vector_db.client.scroll.call_args.kwargs["collection_name"] == vector_db.state_collection_name
+
+    def test_set_etags_creates_state_collection_and_upserts(self, setup_mock_database):
+        """Test set_etags creates the vectorless state collection once and upserts one point per URL."""
+        vector_db = setup_mock_database
+        vector_db.client.collection_exists.return_value = False
+
+        vector_db.set_etags("github", {"https://a": '"1"'})
+
+        create_kwargs = vector_db.client.create_collection.call_args.kwargs
+        assert create_kwargs["collection_name"] == vector_db.state_collection_name
+        assert create_kwargs["vectors_config"] == {}
+        points = vector_db.client.upsert.call_args.kwargs["points"]
+        assert [point.payload for point in points] == [
+            {"source": "github", "url": "https://a", "etag": '"1"'}
+        ]
+
+    def test_set_etags_skips_empty_dict(self, setup_mock_database):
+        """Test set_etags does nothing when there are no ETags."""
+        vector_db = setup_mock_database
+
+        vector_db.set_etags("github", {})
+
+        vector_db.client.upsert.assert_not_called()
 
     def test_close(self, setup_mock_database):
         """Test close calls client.close()"""
@@ -0,0 +1,80 @@
+"""Tests for the shared scraper base class and Document record."""
+import asyncio
+import threading
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+
+import pytest
+from ingestion.scrapers.base import BaseScraper, Document
+
+
+def _make_document(**overrides):
+    """Build a Document with sensible defaults."""
+    fields = {
+        'title': 'Post',
+        'content': 'Post content',
+        'url': 'https://example.com/post',
+        'published_date': datetime(2024, 1, 1, tzinfo=timezone.utc),
+        'source': 'medium',
+    }
+    fields.update(overrides)
+    return Document(**fields)
+
+
+class TestDocument:
+    """Test suite for the Document record."""
+
+    def test_document_has_no_instance_dict(self):
+        """Test documents use a fixed slot layout instead of a per-instance dict."""
+        assert not hasattr(_make_document(), '__dict__')
+
+    def test_document_is_frozen(self):
+        """Test documents cannot be mutated after creation."""
+        doc = _make_document()
+        with pytest.raises(FrozenInstanceError):
+            doc.title = 'Changed'
+
+    def test_document_supports_mapping_access(self):
+        """Test documents can be read like the dicts they replace."""
+        doc = _make_document()
+
+        assert doc['title'] == 'Post'
+        assert doc.get('metadata') == {}
+        assert {**doc, 'content': 'chunk'}['content'] == 'chunk'
+
+    def test_unset_content_hash_is_not_a_key(self):
+        """Test content_hash only appears as a key when it is set."""
+        assert 'content_hash' not in _make_document()
+        assert _make_document().get('content_hash') is None
+        assert _make_document(content_hash='abc')['content_hash'] == 'abc'
+
+    def test_to_dict_matches_legacy_document_dict(self):
+        """Test to_dict returns the same keys the old dict documents had."""
+        doc = _make_document(metadata={'type': 'post'})
+
+        assert doc.to_dict() == {
+            'title': 'Post',
+            'content': 'Post content',
+            'url': 'https://example.com/post',
+            'published_date': datetime(2024, 1, 1, tzinfo=timezone.utc),
+            'source': 'medium',
+            'metadata': {'type': 'post'},
+        }
+
+
+class TestBaseScraper:
+    """Test suite for shared BaseScraper behaviour."""
+
+    def test_scrape_async_runs_sync_scrape_in_worker_thread(self):
+        """Test the default scrape_async delegates to scrape off the event loop thread."""
+        class StubScraper(BaseScraper):
+            SOURCE_NAME = 'stub'
+
+            def scrape(self, last_scraped_date=None):
+                self.thread = threading.current_thread()
+                return [last_scraped_date]
+
+        scraper = StubScraper('user')
+
+        assert asyncio.run(scraper.scrape_async(last_scraped_date='cutoff')) == ['cutoff']
+        assert scraper.thread is not threading.main_thread()
@@ -0,0 +1,540 @@
+"""Tests for the GitHub scraper."""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+from ingestion.scrapers.github import GitHubScraper, _RateLimiter
+
+
+REPOS_URL = "https://api.github.com/users/testuser/repos"
+
+
+def _make_repo(name, updated_at="2024-01-01T00:00:00Z"):
+    """Build a repository payload shaped like the GitHub REST API."""
+    return {
+        "name": name,
+        "description": f"{name} description",
+        "language": "Python",
+        "stargazers_count": 1,
+        "forks_count": 0,
+        "open_issues_count": 0,
+        "topics": ["rag"],
+        "html_url": f"https://github.com/testuser/{name}",
+        "updated_at": updated_at,
+        "fork": False,
+    }
+
+
+def _make_client(handler):
+    """Build an AsyncClient whose requests are answered by handler."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _repos_handler(last_page=1, failing_page=None):
+    """Serve one repository per page, advertising last_page in the Link header."""
+    def handler(request):
+        page = int(request.url.params.get("page", 1))
+        if page == failing_page:
+            return httpx.Response(500)
+        headers = {}
+        if page == 1 and last_page > 1:
+            headers["Link"] = f'<{REPOS_URL}?per_page=100&page={last_page}>; rel="last"'
+        return httpx.Response(200, json=[_make_repo(f"repo{page}")], headers=headers)
+    return handler
+
+
+def _make_graphql_user(repo_names, has_next_page=False, end_cursor=None):
+    """Build a GraphQL user node shaped like the scraper's query."""
+    return {
+        "login": "testuser",
+        "name": "Test User",
+        "bio": "Builds things",
+        "company": None,
+        "location": "Singapore",
+        "websiteUrl": "https://example.com",
+        "url": "https://github.com/testuser",
+        "createdAt": "2020-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "followers": {"totalCount": 5},
+        "following": {"totalCount": 2},
+        "publicRepos": {"totalCount": len(repo_names)},
+        "repositories": {
+            "pageInfo": {"hasNextPage": has_next_page, "endCursor": end_cursor},
+            "nodes": [
+                {
+                    "name": name,
+                    "description": f"{name} description",
+                    "url": f"https://github.com/testuser/{name}",
+                    "updatedAt": "2024-01-01T00:00:00Z",
+                    "isFork": False,
+                    "stargazerCount": 3,
+                    "forkCount": 1,
+                    "primaryLanguage": {"name": "Python"},
+                    "issues": {"totalCount": 0},
+                    "repositoryTopics": {"nodes": [{"topic": {"name": "rag"}}]},
+                }
+                for name in repo_names
+            ],
+        },
+    }
+
+
+def _run(coro_fn, handler):
+    """Run a scraper coroutine against a mock transport, returning its result."""
+    async def run():
+        async with _make_client(handler) as client:
+            return await coro_fn(client, asyncio.Semaphore(GitHubScraper.MAX_CONCURRENT_REQUESTS))
+    return asyncio.run(run())
+
+
+class TestGitHubScraper:
+    """Test suite for GitHubScraper class."""
+
+    @pytest.fixture
+    def scraper(self):
+        """Fixture providing a GitHubScraper instance."""
+        return GitHubScraper(username="testuser", token="token")
+
+    def test_init_requires_username(self, monkeypatch):
+        """Test initialization fails without a username."""
+        monkeypatch.delenv("GITHUB_USERNAME", raising=False)
+        with pytest.raises(ValueError, match="GITHUB_USERNAME"):
+            GitHubScraper()
+
+    def test_init_sets_auth_header(self):
+        """Test requests authenticate when a token is given."""
+        scraper = GitHubScraper(username="testuser", token="secret")
+        assert scraper.headers["Authorization"] == "token secret"
+
+    @patch("ingestion.scrapers.github.httpx.AsyncHTTPTransport")
+    @patch("ingestion.scrapers.github.httpx.AsyncClient")
+    def test_create_client_uses_http2(self, mock_client, mock_transport, scraper):
+        """Test the client negotiates HTTP/2, retries connects and sends the auth headers."""
+        scraper._create_client()
+
+        transport_kwargs = mock_transport.call_args.kwargs
+        assert transport_kwargs["http2"] is True
+        assert transport_kwargs["retries"] == GitHubScraper.CONNECT_RETRIES
+        assert transport_kwargs["limits"].max_connections == GitHubScraper.MAX_CONNECTIONS
+        mock_client.assert_called_once_with(
+            transport=mock_transport.return_value,
+            headers=scraper.headers,
+            timeout=GitHubScraper.REQUEST_TIMEOUT_SECONDS,
+        )
+
+    def test_scrape_repositories_single_page(self, scraper):
+        """Test a single page of repositories is fetched once."""
+        handler = Mock(side_effect=_repos_handler())
+
+        repos = _run(scraper._scrape_repositories, handler)
+
+        assert [repo["title"] for repo in repos] == ["Repository: repo1"]
+        handler.assert_called_once()
+
+    def test_scrape_repositories_fetches_remaining_pages_from_link_header(self, scraper):
+        """Test pages after the first are fetched using the Link header's last page."""
+        handler = Mock(side_effect=_repos_handler(last_page=3))
+
+        repos = _run(scraper._scrape_repositories, handler)
+
+        assert [repo["title"] for repo in repos] == [
+            "Repository: repo1", "Repository: repo2", "Repository: repo3"
+        ]
+        requested_pages = sorted(int(call.args[0].url.params["page"]) for call in handler.call_args_list)
+        assert requested_pages == [1, 2, 3]
+
+    @patch("ingestion.scrapers.github.asyncio.sleep", new_callable=AsyncMock)
+    def test_scrape_repositories_keeps_pages_that_succeeded(self, mock_sleep, scraper, capsys):
+        """Test a failing page is skipped without dropping the others."""
+        repos = _run(scraper._scrape_repositories, _repos_handler(last_page=2, failing_page=2))
+
+        assert [repo["title"] for repo in repos] == ["Repository: repo1"]
+        assert "page 2" in capsys.readouterr().out
+
+    @patch("ingestion.scrapers.github.asyncio.sleep", new_callable=AsyncMock)
+    def test_get_retries_after_rate_limit(self, mock_sleep, scraper):
+        """Test rate-limited responses are retried after Retry-After."""
+        responses = iter([
+            httpx.Response(403, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"login": "testuser"}),
+        ])
+
+        response = _run(
+            lambda client, semaphore: scraper._request(client, semaphore, "GET", "https://api.github.com/users/testuser"),
+            lambda request: next(responses),
+        )
+
+        assert response.status_code == 200
+        mock_sleep.assert_awaited_once_with(2.0)
+
+    @patch("ingestion.scrapers.github.asyncio.sleep", new_callable=AsyncMock)
+    def test_request_backs_off_on_server_errors(self, mock_sleep, scraper):
+        """Test transient 5xx responses are retried with exponential backoff."""
+        responses = iter([httpx.Response(502), httpx.Response(503), httpx.Response(200, json={})])
+
+        response = _run(
+            lambda client, semaphore: scraper._request(client, semaphore, "GET", "https://api.github.com/users/testuser"),
+            lambda request: next(responses),
+        )
+
+        assert response.status_code == 200
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [
+            GitHubScraper.RETRY_BACKOFF_SECONDS, GitHubScraper.RETRY_BACKOFF_SECONDS * 2
+        ]
+
+    def test_get_does_not_retry_other_errors(self, scraper):
+        """Test non rate-limit errors are returned immediately."""
+        handler = Mock(return_value=httpx.Response(404))
+
+        response = _run(
+            lambda client, semaphore: scraper._request(client, semaphore, "GET", "https://api.github.com/users/testuser"),
+            handler,
+        )
+
+        assert response.status_code == 404
+        handler.assert_called_once()
+
+    def test_scrape_fetches_profile_and_repositories(self):
+        """Test the sync entry point returns the profile and repositories over REST without a token."""
+        scraper = GitHubScraper(username="testuser", token="")
+        repos_handler = _repos_handler()
+
+        def handler(request):
+            if request.url.path == "/users/testuser":
+                return httpx.Response(200, json={
+                    "login": "testuser",
+                    "name": "Test User",
+                    "html_url": "https://github.com/testuser",
+                    "updated_at": "2024-01-01T00:00:00Z",
+                    "public_repos": 1,
+                    "followers": 0,
+                    "following": 0,
+                    "created_at": "2020-01-01T00:00:00Z",
+                })
+            return repos_handler(request)
+
+        with patch.object(scraper, "_create_client", side_effect=lambda: _make_client(handler)):
+            documents = scraper.scrape()
+
+        assert [doc["title"] for doc in documents] == ["GitHub Profile: Test User", "Repository: repo1"]
+
+    def test_scrape_graphql_fetches_profile_and_repositories_in_one_request(self, scraper):
+        """Test the GraphQL query returns the profile and repository documents."""
+        handler = Mock(return_value=httpx.Response(
+            200, json={"data": {"user": _make_graphql_user(["one", "two"])}}
+        ))
+
+        documents = _run(scraper._scrape_graphql, handler)
+
+        assert [doc["title"] for doc in documents] == [
+            "GitHub Profile: Test User", "Repository: one", "Repository: two"
+        ]
+        assert "Topics: rag" in documents[1]["content"]
+        assert documents[1]["metadata"]["language"] == "Python"
+        request = handler.call_args.args[0]
+        assert request.url == GitHubScraper.GRAPHQL_URL
+        assert request.headers["Authorization"] == "bearer token"
+
+    def test_scrape_graphql_follows_repository_cursor(self, scraper):
+        """Test later repository pages are requested with the previous end cursor."""
+        pages = {
+            None: _make_graphql_user(["one"], has_next_page=True, end_cursor="abc"),
+            "abc": _make_graphql_user(["two"]),
+        }
+
+        include_profile = []
+
+        def handler(request):
+            variables = json.loads(request.content)["variables"]
+            include_profile.append(variables["includeProfile"])
+            return httpx.Response(200, json={"data": {"user": pages[variables["cursor"]]}})
+
+        documents = _run(scraper._scrape_graphql, handler)
+
+        assert include_profile == [True, False]
+
+        assert [doc["title"] for doc in documents] == [
+            "GitHub Profile: Test User", "Repository: one", "Repository: two"
+        ]
+
+    def test_scrape_graphql_returns_none_on_errors(self, scraper, capsys):
+        """Test GraphQL errors are reported so the caller can fall back to REST."""
+        handler = Mock(return_value=httpx.Response(
+            200, json={"data": None, "errors": [{"message": "Bad credentials"}]}
+        ))
+
+        assert _run(scraper._scrape_graphql, handler) is None
+        assert "Bad credentials" in capsys.readouterr().out
+
+    def test_scrape_falls_back_to_rest_when_graphql_fails(self, scraper):
+        """Test a failed GraphQL query falls back to the REST endpoints."""
+        repos_handler = _repos_handler()
+
+        def handler(request):
+            if request.url == GitHubScraper.GRAPHQL_URL:
+                return httpx.Response(401)
+            if request.url.path == "/users/testuser":
+                return httpx.Response(404)
+            return repos_handler(request)
+
+        with patch.object(scraper, "_create_client", side_effect=lambda: _make_client(handler)):
+            documents = scraper.scrape()
+
+        assert [doc["title"] for doc in documents] == ["Repository: repo1"]
+
+    def test_conditional_get_sends_stored_etag_and_records_new_one(self, scraper):
+        """Test stored ETags are sent as If-None-Match and fresh ones remembered."""
+        url = "https://api.github.com/users/testuser"
+        scraper.etags = {url: '"old"'}
+        handler = Mock(return_value=httpx.Response(200, json={}, headers={"ETag": '"new"'}))
+
+        _run(lambda client, semaphore: scraper._conditional_get(client, semaphore, url), handler)
+
+        assert handler.call_args.args[0].headers["If-None-Match"] == '"old"'
+        assert scraper.etags[url] == '"new"'
+
+    def test_scrape_repositories_skips_remaining_pages_when_first_page_unchanged(self, scraper):
+        """Test a 304 for the first page skips parsing and the remaining pages."""
+        handler = Mock(return_value=httpx.Response(304))
+
+        repos = _run(scraper._scrape_repositories, handler)
+
+        assert repos == []
+        handler.assert_called_once()
+
+    def test_scrape_skips_graphql_when_probes_are_unchanged(self, scraper, capsys):
+        """Test the GraphQL query is skipped when the conditional probes return 304."""
+        handler = Mock(return_value=httpx.Response(304))
+
+        with patch.object(scraper, "_create_client", side_effect=lambda: _make_client(handler)):
+            documents = scraper.scrape(
+                last_scraped_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                etags={"https://api.github.com/users/testuser": '"1"'},
+            )
+
+        assert documents == []
+        assert all(call.args[0].method == "GET" for call in handler.call_args_list)
+        assert "unchanged" in capsys.readouterr().out
+
+    def test_scrape_ignores_etags_without_stored_documents(self):
+        """Test stored ETags are not sent when nothing has been scraped yet."""
+        scraper = GitHubScraper(username="testuser", token="")
+        repos_handler = _repos_handler()
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if "If-None-Match" in request.headers:
+                return httpx.Response(304)
+            if request.url.path == "/users/testuser":
+                return httpx.Response(404)
+            return repos_handler(request)
+
+        etags = {
+            "https://api.github.com/users/testuser": '"1"',
+            f"{REPOS_URL}?per_page=100&page=1": '"2"',
+        }
+        with patch.object(scraper, "_create_client", side_effect=lambda: _make_client(handler)):
+            documents = scraper.scrape(etags=etags)
+
+        assert [doc["title"] for doc in documents] == ["Repository: repo1"]
+        assert all("If-None-Match" not in request.headers for request in requests)
+
+    def test_extract_profile_parts_skips_empty_optional_fields(self, scraper):
+        """Test only populated optional profile fields are included, in order."""
+        user = _make_graphql_user([])
+        profile = GitHubScraper._normalize_graphql_profile(user)
+
+        parts = scraper._extract_profile_parts(profile)
+
+        assert parts == [
+            "Username: testuser",
+            "Name: Test User",
+            "Bio: Builds things",
+            "Location: Singapore",
+            "Blog: https://example.com",
+            "Public Repositories: 0",
+            "Followers: 5",
+            "Following: 2",
+            "Created at: 2020-01-01T00:00:00Z",
+        ]
+
+    @pytest.mark.parametrize("description,expected", [
+        ("A repo", "Repository: one | Description: A repo | Language: Python"),
+        (None, "Repository: one | Language: Python"),
+    ])
+    def test_build_repo_content_includes_description_when_present(self, scraper, description, expected):
+        """Test the description part is only included when the repository has one."""
+        repo = {**_make_repo("one"), "description": description}
+
+        content = scraper._build_repo_content(repo)
+
+        assert content.startswith(expected + " | ")
+
+    def test_build_repo_content_lists_every_field(self, scraper):
+        """Test repository content includes each field, joined by the content separator."""
+        repo = {**_make_repo("one"), "language": None, "topics": ["rag", "llm"]}
+
+        assert scraper._build_repo_content(repo) == (
+            "Repository: one | Description: one description | Language: N/A | Stars: 1"
+            " | Forks: 0 | Open Issues: 0 | Topics: rag, llm | URL: https://github.com/testuser/one"
+        )
+
+    def test_parse_iso_date_accepts_z_suffix(self, scraper):
+        """Test GitHub's 'Z' timestamps parse as timezone-aware UTC datetimes."""
+        parsed = scraper._parse_iso_date("2024-01-02T03:04:05Z")
+
+        assert parsed == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    def test_scrape_repositories_stops_at_last_scraped_date(self, scraper):
+        """Test pages are not fetched once a page reaches the last scraped date."""
+        updated = {1: "2024-03-01T00:00:00Z", 2: "2024-01-01T00:00:00Z"}
+
+        def handler(request):
+            page = int(request.url.params["page"])
+            headers = {"Link": f'<{REPOS_URL}?page=20>; rel="last"'} if page == 1 else {}
+            updated_at = updated.get(page, "2023-01-01T00:00:00Z")
+            return httpx.Response(200, json=[_make_repo(f"repo{page}", updated_at)], headers=headers)
+
+        handler = Mock(side_effect=handler)
+        last_scraped_date = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+        repos = _run(
+            lambda client, semaphore: scraper._scrape_repositories(client, semaphore, last_scraped_date),
+            handler,
+        )
+
+        assert [repo["title"] for repo in repos] == ["Repository: repo1"]
+        # Page 1 plus one wave of concurrent pages; the wave reached the cutoff
+        assert handler.call_count == 1 + GitHubScraper.MAX_CONCURRENT_REQUESTS
+
+    def test_scrape_repositories_parses_only_new_repositories(self, scraper):
+        """Test repositories at or before the last scraped date are dropped before parsing."""
+        def handler(request):
+            return httpx.Response(200, json=[
+                _make_repo("new", "2024-03-01T00:00:00Z"),
+                _make_repo("old", "2024-01-01T00:00:00Z"),
+            ])
+
+        last_scraped_date = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        with patch.object(scraper, "_parse_repository", wraps=scraper._parse_repository) as parse:
+            repos = _run(
+                lambda client, semaphore: scraper._scrape_repositories(client, semaphore, last_scraped_date),
+                handler,
+            )
+
+        assert [repo["title"] for repo in repos] == ["Repository: new"]
+        parse.assert_called_once()
+
+    def test_scrape_repositories_skips_other_pages_when_first_page_is_old(self, scraper):
+        """Test no further pages are fetched when the first page is already old."""
+        handler = Mock(side_effect=_repos_handler(last_page=5))
+        last_scraped_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        repos = _run(
+            lambda client, semaphore: scraper._scrape_repositories(client, semaphore, last_scraped_date),
+            handler,
+        )
+
+        assert repos == []
+        handler.assert_called_once()
+
+    def test_scrape_graphql_stops_paginating_at_last_scraped_date(self, scraper):
+        """Test the GraphQL cursor is not followed past the last scraped date."""
+        handler = Mock(return_value=httpx.Response(200, json={"data": {"user": _make_graphql_user(
+            ["one"], has_next_page=True, end_cursor="abc"
+        )}}))
+        last_scraped_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        documents = _run(
+            lambda client, semaphore: scraper._scrape_graphql(client, semaphore, last_scraped_date),
+            handler,
+        )
+
+        assert documents == []
+        handler.assert_called_once()
+
+    def test_repo_metadata_interns_language(self, scraper):
+        """Test repeated language names share a single string object."""
+        first = scraper._build_repo_metadata({**_make_repo("one"), "language": "".join(["Py", "thon"])})
+        second = scraper._build_repo_metadata({**_make_repo("two"), "language": "".join(["Py", "thon"])})
+
+        assert first["language"] is second["language"]
+        assert scraper._build_repo_metadata({**_make_repo("three"), "language": None})["language"] is None
+
+    def test_parsed_documents_skip_chunking(self, scraper):
+        """Test GitHub documents are marked as fitting in a single chunk."""
+        assert scraper._parse_repository(_make_repo("one")).needs_chunking is False
+
+    def test_scrape_repositories_stops_after_an_unchanged_page(self, scraper):
+        """Test a 304 for a later page stops fetching the pages after its wave."""
+        def handler(request):
+            page = int(request.url.params["page"])
+            if page == 2:
+                return httpx.Response(304)
+            headers = {"Link": f'<{REPOS_URL}?page=20>; rel="last"'} if page == 1 else {}
+            return httpx.Response(200, json=[_make_repo(f"repo{page}")], headers=headers)
+
+        handler = Mock(side_effect=handler)
+
+        repos = _run(scraper._scrape_repositories, handler)
+
+        assert "Repository: repo1" in [repo["title"] for repo in repos]
+        assert handler.call_count == 1 + GitHubScraper.MAX_CONCURRENT_REQUESTS
+
+
+class TestRateLimiter:
+    """Test suite for the GitHub rate limiter."""
+
+    @pytest.fixture
+    def limiter(self):
+        """Fixture providing a limiter that paces below 8 remaining requests."""
+        return _RateLimiter(min_remaining=8, max_wait_seconds=60)
+
+    def _update(self, limiter, remaining, reset_in):
+        limiter.update(httpx.Response(200, headers={
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(time.time() + reset_in),
+        }))
+
+    def test_no_delay_without_headers(self, limiter):
+        """Test requests are not paced before any quota is known."""
+        limiter.update(httpx.Response(200))
+        assert limiter.delay() == 0.0
+
+    def test_no_delay_with_plenty_of_quota(self, limiter):
+        """Test requests are not paced while the quota is comfortable."""
+        self._update(limiter, remaining=4000, reset_in=3600)
+        assert limiter.delay() == 0.0
+
+    def test_spreads_remaining_quota_until_reset(self, limiter):
+        """Test low quota spreads the remaining requests over the time to reset."""
+        self._update(limiter, remaining=4, reset_in=20)
+        assert limiter.delay() == pytest.approx(5, abs=0.1)
+
+    def test_delay_is_capped(self, limiter):
+        """Test an exhausted quota never waits longer than the cap."""
+        self._update(limiter, remaining=0, reset_in=3600)
+        assert limiter.delay() == 60
+
+    @patch("ingestion.scrapers.github.asyncio.sleep", new_callable=AsyncMock)
+    def test_request_waits_for_rate_limiter(self, mock_sleep):
+        """Test _request paces the next request using the previous response's quota."""
+        scraper = GitHubScraper(username="testuser", token="token")
+        reset_at = str(time.time() + 20)
+        handler = Mock(return_value=httpx.Response(
+            200, json={}, headers={"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": reset_at}
+        ))
+
+        async def two_requests(client, semaphore):
+            await scraper._request(client, semaphore, "GET", REPOS_URL)
+            await scraper._request(client, semaphore, "GET", REPOS_URL)
+
+        _run(two_requests, handler)
+
+        mock_sleep.assert_awaited_once()
+        assert mock_sleep.await_args.args[0] == pytest.approx(5, abs=0.1)
@@ -1,6 +1,7 @@
+import feedparser
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import datetime, timezone
 from ingestion.scrapers.medium import MediumScraper
 
 
@@ -48,6 +49,28 @@ class TestMediumScraper:
         result = scraper._extract_text_from_html("")
         assert result == ""
 
+    @pytest.mark.parametrize("html", [
+        "<p>Hello <strong>World</strong></p><div>Test</div>",
+        "<!-- note --><p>a</p><script>var x = 1</script>mid<style>p {}</style>tail",
+        "<figure><img src='x'><figcaption>Cap</figcaption></figure><p>a &amp; b<br>c</p>",
+        "plain text",
+        "   ",
+    ])
+    def test_extract_text_from_html_matches_beautifulsoup(self, scraper, html):
+        """Test the lxml fast path extracts the same text as BeautifulSoup."""
+        pytest.importorskip("lxml")
+        from bs4 import BeautifulSoup
+
+        expected = BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)
+
+        assert scraper._extract_text_from_html(html) == expected
+
+    def test_extract_text_from_html_without_lxml(self, scraper):
+        """Test BeautifulSoup is used when lxml is not installed."""
+        with patch('ingestion.scrapers.medium.lxml_html', None):
+            result = scraper._extract_text_from_html("<p>Hello <strong>World</strong></p>")
+        assert result == "Hello World"
+
     def test_parse_entry(self, scraper):
         """Test parsing a feed entry into post dictionary."""
         mock_entry = self._create_mock_entry(
@@ -89,7 +112,7 @@ class TestMediumScraper:
         assert len(result) == 2
         assert result[0]['title'] == "Post 1"
         assert result[1]['title'] == "Post 2"
-        mock_parse.assert_called_once_with("https://medium.com/feed/@testuser")
+        mock_parse.assert_called_once_with("https://medium.com/feed/@testuser", etag=None)
         mock_print.assert_called_once_with("Scraped 2 new Medium posts")
 
     @patch('ingestion.scrapers.medium.feedparser.parse')
@@ -131,6 +154,76 @@ class TestMediumScraper:
         assert result[0]['title'] == "New Post"
         mock_print.assert_called_once_with("Scraped 1 new Medium posts")
 
+    @patch('ingestion.scrapers.medium.feedparser.parse')
+    def test_scrape_skips_html_of_old_entries(self, mock_parse, scraper):
+        """Test only entries newer than last_scraped_date have their HTML parsed."""
+        old_entry = self._create_mock_entry(
+            "Old Post", "<p>Old content</p>",
+            "https://medium.com/@testuser/old-post",
+            (2024, 1, 10, 10, 0, 0, 0, 10, 0)
+        )
+        new_entry = self._create_mock_entry(
+            "New Post", "<p>New content</p>",
+            "https://medium.com/@testuser/new-post",
+            (2024, 1, 20, 10, 0, 0, 0, 20, 0)
+        )
+        mock_parse.return_value = feedparser.FeedParserDict(status=200, entries=[old_entry, new_entry])
+
+        with patch.object(scraper, '_extract_text_from_html', return_value="text") as mock_extract:
+            scraper.scrape(last_scraped_date=datetime(2024, 1, 15))
+
+        mock_extract.assert_called_once_with("<p>New content</p>")
+
+    @patch('ingestion.scrapers.medium.feedparser.parse')
+    def test_scrape_compares_published_dates_in_utc(self, mock_parse, scraper):
+        """Test entries published at the cutoff are skipped and aware cutoffs are compared in UTC."""
+        entries = [
+            self._create_mock_entry(
+                f"Post {hour}", "<p>content</p>",
+                f"https://medium.com/@testuser/post-{hour}",
+                (2024, 1, 15, hour, 0, 0, 0, 15, 0)
+            )
+            for hour in (9, 10, 11)
+        ]
+        mock_parse.return_value = feedparser.FeedParserDict(status=200, entries=entries)
+
+        naive = scraper.scrape(last_scraped_date=datetime(2024, 1, 15, 10, 0, 0))
+        aware = scraper.scrape(last_scraped_date=datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc))
+
+        assert [doc['title'] for doc in naive] == ["Post 11"]
+        assert [doc['title'] for doc in aware] == ["Post 11"]
+
+    @patch('ingestion.scrapers.medium.feedparser.parse')
+    def test_scrape_records_feed_etag(self, mock_parse, scraper):
+        """Test the feed's ETag is recorded for the next conditional request."""
+        mock_parse.return_value = feedparser.FeedParserDict(status=200, etag='W/"1"', entries=[])
+
+        scraper.scrape()
+
+        assert scraper.etags == {"https://medium.com/feed/@testuser": 'W/"1"'}
+
+    @patch('ingestion.scrapers.medium.feedparser.parse')
+    @patch('builtins.print')
+    def test_scrape_returns_empty_when_feed_unchanged(self, mock_print, mock_parse, scraper):
+        """Test a 304 from a conditional feed request yields no posts."""
+        mock_parse.return_value = feedparser.FeedParserDict(status=304, entries=[])
+        etags = {"https://medium.com/feed/@testuser": 'W/"1"'}
+
+        result = scraper.scrape(last_scraped_date=datetime(2024, 1, 15), etags=etags)
+
+        assert result == []
+        mock_parse.assert_called_once_with("https://medium.com/feed/@testuser", etag='W/"1"')
+        mock_print.assert_called_once_with("Medium feed unchanged, skipping")
+
+    @patch('ingestion.scrapers.medium.feedparser.parse')
+    def test_scrape_ignores_etags_without_stored_posts(self, mock_parse, scraper):
+        """Test the feed is fetched unconditionally when no posts are stored yet."""
+        mock_parse.return_value = feedparser.FeedParserDict(status=200, entries=[])
+
+        scraper.scrape(etags={"https://medium.com/feed/@testuser": 'W/"1"'})
+
+        mock_parse.assert_called_once_with("https://medium.com/feed/@testuser", etag=None)
+
     def test_parse_entry_with_complex_html(self, scraper):
         """Test parsing entry with nested HTML tags."""
         mock_entry = self._create_mock_entry(
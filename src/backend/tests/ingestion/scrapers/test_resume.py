@@ -1,10 +1,11 @@
 """Tests for the Resume PDF scraper."""
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
-from ingestion.scrapers.resume import ResumeScraper
+from ingestion.scrapers.resume import _SESSION, ResumeScraper
 
 
 FAKE_URL = "https://example.com/resume.pdf"
@@ -19,6 +20,21 @@ class TestResumeScraper:
     def scraper(self):
         return ResumeScraper(url=FAKE_URL)
 
+    @pytest.fixture
+    def plumber_scraper(self):
+        return ResumeScraper(url=FAKE_URL, pdf_backend="pdfplumber")
+
+    @staticmethod
+    def _mock_pdfium_document(page_texts):
+        pages = []
+        for text in page_texts:
+            page = MagicMock()
+            page.get_textpage.return_value.get_text_range.return_value = text
+            pages.append(page)
+        pdf = MagicMock()
+        pdf.__iter__.return_value = iter(pages)
+        return pdf, pages
+
     # --- Initialisation ---
 
     def test_init_with_explicit_url(self):
@@ -36,6 +52,13 @@ class TestResumeScraper:
         with pytest.raises(ValueError, match="RESUME_URL"):
             ResumeScraper()
 
+    def test_init_defaults_to_pdfium_backend(self, scraper):
+        assert scraper.pdf_backend == "pdfium"
+
+    def test_init_raises_on_unknown_pdf_backend(self):
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            ResumeScraper(url=FAKE_URL, pdf_backend="pymupdf")
+
     # --- scrape() ---
 
     @patch("ingestion.scrapers.resume.ResumeScraper._fetch_and_extract", return_value=None)
@@ -58,7 +81,7 @@ class TestResumeScraper:
 
     # --- _download_pdf() ---
 
-    @patch("ingestion.scrapers.resume.requests.get")
+    @patch("ingestion.scrapers.resume._SESSION.get")
     def test_download_pdf_plain_url(self, mock_get, scraper):
         mock_response = MagicMock()
         mock_response.content = FAKE_PDF_BYTES
@@ -76,11 +99,65 @@ class TestResumeScraper:
         assert response is None
         mock_gdrive.assert_called_once()
 
+    @patch("ingestion.scrapers.resume._SESSION.get")
+    def test_download_pdf_records_etag(self, mock_get, scraper):
+        mock_get.return_value = MagicMock(status_code=200, content=FAKE_PDF_BYTES, headers={"ETag": '"v1"'})
+        scraper._download_pdf()
+        assert scraper.etags == {FAKE_URL: '"v1"'}
+        assert mock_get.call_args.kwargs["headers"] == {}
+
+    @patch("ingestion.scrapers.resume._SESSION.get")
+    def test_download_pdf_sends_conditional_headers(self, mock_get, scraper):
+        mock_get.return_value = MagicMock(status_code=304, headers={})
+        scraper.etags = {FAKE_URL: '"v1"'}
+
+        pdf_bytes, _ = scraper._download_pdf(datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+        assert pdf_bytes is None
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+
+    @patch("ingestion.scrapers.resume.ResumeScraper._extract_text")
+    @patch("ingestion.scrapers.resume._SESSION.get")
+    def test_scrape_skips_download_when_not_modified(self, mock_get, mock_extract, scraper, capsys):
+        mock_get.return_value = MagicMock(status_code=304, headers={})
+
+        assert scraper.scrape(stored_hash=FAKE_HASH, etags={FAKE_URL: '"v1"'}) == []
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+        mock_extract.assert_not_called()
+        assert "not modified" in capsys.readouterr().out
+
+    @patch("ingestion.scrapers.resume.ResumeScraper._fetch_and_extract", return_value=None)
+    def test_scrape_ignores_etags_without_stored_resume(self, _mock, scraper):
+        scraper.scrape(etags={FAKE_URL: '"v1"'})
+        assert scraper.etags == {}
+
+    def test_download_session_retries_transient_failures(self):
+        retries = _SESSION.get_adapter(FAKE_URL).max_retries
+        assert retries.total == 3
+        assert 503 in retries.status_forcelist
+
+    @patch("gdown.download")
+    def test_download_from_google_drive_reads_into_memory(self, mock_download, scraper):
+        def write_pdf(url, output, **kwargs):
+            output.write(FAKE_PDF_BYTES)
+            return output
+        mock_download.side_effect = write_pdf
+
+        assert scraper._download_from_google_drive() == FAKE_PDF_BYTES
+
+    @patch("gdown.download", return_value=None)
+    def test_download_from_google_drive_raises_on_failure(self, _mock, scraper):
+        with pytest.raises(ValueError, match="gdown failed"):
+            scraper._download_from_google_drive()
+
     # --- _fetch_and_extract() ---
 
-    @patch("ingestion.scrapers.resume.pdfplumber.open")
+    @patch("pdfplumber.open")
     @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
-    def test_fetch_and_extract_returns_doc_with_hash(self, mock_dl, mock_pdf_open, scraper):
+    def test_fetch_and_extract_returns_doc_with_hash(self, mock_dl, mock_pdf_open, plumber_scraper):
         mock_dl.return_value = (FAKE_PDF_BYTES, None)
         mock_page = MagicMock()
         mock_page.extract_text.return_value = "Jason Hee — Software Engineer"
@@ -88,16 +165,16 @@ class TestResumeScraper:
         mock_pdf.pages = [mock_page]
         mock_pdf_open.return_value.__enter__.return_value = mock_pdf
 
-        doc = scraper._fetch_and_extract()
+        doc = plumber_scraper._fetch_and_extract()
 
         assert doc is not None
         assert doc["content_hash"] == FAKE_HASH
         assert "Jason Hee" in doc["content"]
         assert doc["source"] == "resume"
 
-    @patch("ingestion.scrapers.resume.pdfplumber.open")
+    @patch("pdfplumber.open")
     @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
-    def test_fetch_and_extract_returns_none_on_empty_text(self, mock_dl, mock_pdf_open, scraper):
+    def test_fetch_and_extract_returns_none_on_empty_text(self, mock_dl, mock_pdf_open, plumber_scraper):
         mock_dl.return_value = (FAKE_PDF_BYTES, None)
         mock_page = MagicMock()
         mock_page.extract_text.return_value = ""
@@ -105,8 +182,99 @@ class TestResumeScraper:
         mock_pdf.pages = [mock_page]
         mock_pdf_open.return_value.__enter__.return_value = mock_pdf
 
+        assert plumber_scraper._fetch_and_extract() is None
+
+    @patch("pdfplumber.open")
+    @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
+    def test_fetch_and_extract_closes_each_page(self, mock_dl, mock_pdf_open, plumber_scraper):
+        mock_dl.return_value = (FAKE_PDF_BYTES, None)
+        pages = [MagicMock(), MagicMock()]
+        pages[0].extract_text.return_value = "  Jason Hee\n"
+        pages[1].extract_text.return_value = None
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf_open.return_value.__enter__.return_value = mock_pdf
+
+        doc = plumber_scraper._fetch_and_extract()
+
+        assert doc["content"] == "Jason Hee"
+        for page in pages:
+            page.close.assert_called_once()
+
+    @patch("ingestion.scrapers.resume.pdfium.PdfDocument")
+    @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
+    def test_fetch_and_extract_with_pdfium(self, mock_dl, mock_pdf_document, scraper):
+        mock_dl.return_value = (FAKE_PDF_BYTES, None)
+        pdf, pages = self._mock_pdfium_document(["Jason Hee\r\nSoftware Engi\ufffeneer\r\n", "Singapore"])
+        mock_pdf_document.return_value = pdf
+
+        doc = scraper._fetch_and_extract()
+
+        mock_pdf_document.assert_called_once_with(FAKE_PDF_BYTES)
+        assert doc["content"] == "Jason Hee\nSoftware Engineer\n\nSingapore"
+        assert doc["content_hash"] == FAKE_HASH
+        assert doc["metadata"]["pages"] == 2
+        for page in pages:
+            page.get_textpage.return_value.close.assert_called_once()
+            page.close.assert_called_once()
+        pdf.close.assert_called_once()
+
+    @patch("ingestion.scrapers.resume.pdfium.PdfDocument")
+    @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
+    def test_fetch_and_extract_with_pdfium_returns_none_on_empty_text(self, mock_dl, mock_pdf_document, scraper):
+        mock_dl.return_value = (FAKE_PDF_BYTES, None)
+        mock_pdf_document.return_value, _ = self._mock_pdfium_document(["\r\n", ""])
+
         assert scraper._fetch_and_extract() is None
 
+    @patch("ingestion.scrapers.resume.ResumeScraper._extract_text")
+    @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
+    def test_fetch_and_extract_skips_parsing_when_hash_matches(self, mock_dl, mock_extract, scraper, capsys):
+        mock_dl.return_value = (FAKE_PDF_BYTES, None)
+
+        assert scraper._fetch_and_extract(stored_hash=FAKE_HASH) is None
+        mock_extract.assert_not_called()
+        assert "Resume unchanged" in capsys.readouterr().out
+
+    @patch("ingestion.scrapers.resume.ResumeScraper._extract_text")
+    @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf")
+    def test_scrape_returns_empty_when_hash_matches(self, mock_dl, mock_extract, scraper):
+        mock_dl.return_value = (FAKE_PDF_BYTES, None)
+
+        assert scraper.scrape(stored_hash=FAKE_HASH) == []
+        mock_extract.assert_not_called()
+
+    @patch(
+        "ingestion.scrapers.resume.ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+    @patch("ingestion.scrapers.resume.os.cpu_count", return_value=4)
+    @patch("pdfplumber.open")
+    def test_extract_text_splits_long_pdfs_into_ordered_ranges(self, mock_pdf_open, _mock_cpus, scraper):
+        pages = [MagicMock() for _ in range(10)]
+        for number, page in enumerate(pages):
+            page.extract_text.return_value = f"{number},"
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf_open.return_value.__enter__.return_value = mock_pdf
+
+        text = scraper._extract_text_from_pdf(mock_pdf, FAKE_PDF_BYTES)
+
+        assert text == "0,1,2,3,4,5,6,7,8,9,"
+        assert mock_pdf_open.call_count == 4
+        for page in pages:
+            page.extract_text.assert_called_once()
+            page.close.assert_called_once()
+
+    @patch("ingestion.scrapers.resume.ProcessPoolExecutor")
+    def test_extract_text_keeps_short_pdfs_in_process(self, mock_executor, scraper):
+        mock_pdf = MagicMock()
+        mock_pdf.pages = [MagicMock()]
+        mock_pdf.pages[0].extract_text.return_value = "Jason Hee"
+
+        assert scraper._extract_text_from_pdf(mock_pdf, FAKE_PDF_BYTES) == "Jason Hee"
+        mock_executor.assert_not_called()
+
     @patch("ingestion.scrapers.resume.ResumeScraper._download_pdf", side_effect=Exception("network error"))
     def test_fetch_and_extract_returns_none_on_error(self, _mock, scraper, capsys):
         assert scraper._fetch_and_extract() is None
@@ -1,5 +1,7 @@
 import pytest
+from datetime import datetime
 from ingestion.chunker import TextChunker
+from ingestion.scrapers.base import Document
 
 
 class TestTextChunker:
@@ -133,10 +135,55 @@ class TestTextChunker:
         # Other chunks should not be affected
         assert result[1]['source'] == 'test'
 
+    def test_chunk_documents_formats_published_date_once(self):
+        """Test that published_date is converted to one shared ISO string per document."""
+
+        chunker = TextChunker(chunk_size=3, overlap=1)
+        published_date = datetime(2024, 1, 1, 12, 0)
+        documents = [{'content': 'one two three four', 'published_date': published_date}]
+
+        result = chunker.chunk_documents(documents)
+
+        assert all(chunk['published_date'] == '2024-01-01T12:00:00' for chunk in result)
+        assert result[0]['published_date'] is result[1]['published_date']
+        assert documents[0]['published_date'] is published_date
+
+    def test_chunk_documents_shares_nested_metadata(self):
+        """Test that chunks are shallow copies and reuse the original metadata object."""
+        chunker = TextChunker(chunk_size=3, overlap=1)
+        metadata = {'pages': 2}
+        documents = [{'content': 'one two three four', 'metadata': metadata}]
+
+        result = chunker.chunk_documents(documents)
+
+        assert all(chunk['metadata'] is metadata for chunk in result)
+
+    def test_iter_chunks_is_lazy(self):
+        """Test iter_chunks only chunks documents as they are consumed."""
+        chunker = TextChunker(chunk_size=3, overlap=1)
+        consumed = []
+
+        def documents():
+            for i in range(3):
+                consumed.append(i)
+                yield {'content': f'doc {i} words here', 'title': f'Doc {i}'}
+
+        chunks = chunker.iter_chunks(documents())
+        first = next(chunks)
+
+        assert first['title'] == 'Doc 0'
+        assert consumed == [0]
+        assert len(list(chunks)) + 1 == len(chunker.chunk_documents(
+            {'content': f'doc {i} words here'} for i in range(3)
+        ))
+
     @pytest.mark.parametrize("chunk_size,overlap,word_count,expected_chunks", [
         (10, 2, 25, 3),
         (5, 0, 20, 4),
         (100, 10, 50, 1),
+        (5, 1, 9, 2),
+        (5, 1, 10, 3),
+        (5, 4, 3, 1),
     ])
     def test_chunk_text_various_sizes(self, chunk_size, overlap, word_count, expected_chunks):
         """Test chunking with various size parameters."""
@@ -161,3 +208,21 @@ class TestTextChunker:
         assert result['title'] == 'Test'
         assert result['url'] == 'https://example.com'
         assert original_doc['content'] == 'original content'  # Original unchanged
+
+    def test_iter_chunks_keeps_single_chunk_documents_whole(self):
+        """Test documents flagged as not needing chunking become one unsplit chunk."""
+        chunker = TextChunker(chunk_size=2, overlap=0)
+        doc = Document(
+            title='Repository: one',
+            content='Repository: one | Language: Python',
+            url='https://github.com/testuser/one',
+            published_date=datetime(2024, 1, 1),
+            source='github',
+            needs_chunking=False,
+        )
+
+        result = chunker.chunk_documents([doc])
+
+        assert [chunk['content'] for chunk in result] == ['Repository: one | Language: Python']
+        assert result[0]['chunk_index'] == 0
+        assert 'needs_chunking' not in result[0]
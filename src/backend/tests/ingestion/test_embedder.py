@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 from unittest.mock import Mock, patch
 import numpy as np
@@ -13,22 +15,27 @@ class TestEmbedder:
     @pytest.fixture
     def mock_embedder_setup(self):
         """Fixture to create mock TextEmbedding and Embedder instance."""
+        Embedder.reset_cache()
         with patch('ingestion.embedder.TextEmbedding') as mock_text_embedding:
             with patch('ingestion.embedder.Embedder._resolve_embedding_dim', return_value=384):
                 mock_model = Mock()
                 mock_text_embedding.return_value = mock_model
                 yield mock_text_embedding, mock_model
+        Embedder.reset_cache()
 
-    def _create_embedder(self, mock_setup, model_name=None):
+    def _create_embedder(self, mock_setup, model_name=None, embedding_dim=None):
         """Helper to create Embedder instance with mocked dependencies."""
-        return Embedder(model_name=model_name) if model_name else Embedder()
+        embedder = Embedder(model_name=model_name) if model_name else Embedder()
+        if embedding_dim is not None:
+            embedder.embedding_dim = embedding_dim
+        return embedder
 
     def test_init_default_model(self, mock_embedder_setup):
         """Test embedder initialization with default model."""
         mock_text_embedding, mock_model = mock_embedder_setup
         embedder = self._create_embedder(mock_embedder_setup)
 
-        mock_text_embedding.assert_called_once_with(model_name=self.DEFAULT_MODEL)
+        mock_text_embedding.assert_called_once_with(model_name=self.DEFAULT_MODEL, providers=None)
         assert embedder.model == mock_model
         assert embedder.embedding_dim == self.DEFAULT_EMBEDDING_DIM
 
@@ -37,9 +44,34 @@ class TestEmbedder:
         mock_text_embedding, _ = mock_embedder_setup
         embedder = self._create_embedder(mock_embedder_setup, "custom-model")
 
-        mock_text_embedding.assert_called_once_with(model_name="custom-model")
+        mock_text_embedding.assert_called_once_with(model_name="custom-model", providers=None)
         assert embedder.embedding_dim == self.DEFAULT_EMBEDDING_DIM
 
+    def test_init_reuses_loaded_model(self, mock_embedder_setup):
+        """Test embedders for the same model share one loaded model."""
+        mock_text_embedding, mock_model = mock_embedder_setup
+
+        first = self._create_embedder(mock_embedder_setup)
+        second = self._create_embedder(mock_embedder_setup)
+        other = self._create_embedder(mock_embedder_setup, "custom-model")
+
+        assert first.model is second.model is mock_model
+        assert mock_text_embedding.call_count == 2
+        assert other.embedding_dim == self.DEFAULT_EMBEDDING_DIM
+
+    def test_init_passes_execution_providers(self, mock_embedder_setup):
+        """Test configured ONNX Runtime providers reach fastembed and get their own cached model."""
+        mock_text_embedding, _ = mock_embedder_setup
+
+        Embedder(providers=["OpenVINOExecutionProvider"])
+        Embedder(providers=["OpenVINOExecutionProvider"])
+        Embedder()
+
+        assert mock_text_embedding.call_count == 2
+        mock_text_embedding.assert_any_call(
+            model_name=self.DEFAULT_MODEL, providers=("OpenVINOExecutionProvider",)
+        )
+
     def test_embed_text(self, mock_embedder_setup):
         """Test embedding single text."""
         _, mock_model = mock_embedder_setup
@@ -52,18 +84,54 @@ class TestEmbedder:
         mock_model.embed.assert_called_once_with(["test text"])
         np.testing.assert_array_equal(result, np.array(expected_embedding))
 
+    def test_embed_text_does_not_copy_model_output(self, mock_embedder_setup):
+        """Test a float32 vector from the model is returned as is."""
+        _, mock_model = mock_embedder_setup
+        vector = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+        mock_model.embed.return_value = iter([vector])
+
+        embedder = self._create_embedder(mock_embedder_setup)
+
+        assert embedder.embed_text("test text") is vector
+
     def test_embed_batch(self, mock_embedder_setup):
         """Test embedding multiple texts."""
         _, mock_model = mock_embedder_setup
         expected_embeddings = [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
         mock_model.embed.return_value = iter(expected_embeddings)
 
-        embedder = self._create_embedder(mock_embedder_setup)
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=2)
         texts = ["text1", "text2", "text3"]
         result = embedder.embed_batch(texts)
 
-        mock_model.embed.assert_called_once_with(texts)
-        np.testing.assert_array_equal(result, np.array(expected_embeddings))
+        mock_model.embed.assert_called_once_with(texts, batch_size=Embedder.BATCH_SIZE, parallel=None)
+        np.testing.assert_array_almost_equal(result, np.array(expected_embeddings))
+        assert result.dtype == np.float32
+        assert result.flags['C_CONTIGUOUS']
+
+    def test_embed_batch_uses_all_cpus_for_large_batches(self, mock_embedder_setup):
+        """Test large batches are encoded with one worker per CPU."""
+        _, mock_model = mock_embedder_setup
+        texts = ["text"] * Embedder.PARALLEL_MIN_TEXTS
+        mock_model.embed.return_value = iter([[0.1]] * len(texts))
+
+        embedder = self._create_embedder(mock_embedder_setup)
+        embedder.embed_batch(texts)
+
+        assert mock_model.embed.call_args.kwargs["parallel"] == 0
+
+    def test_embed_batch_encodes_multiple_batches_shortest_first(self, mock_embedder_setup):
+        """Test texts spanning several batches are encoded by length and returned in input order."""
+        _, mock_model = mock_embedder_setup
+        texts = ["x" * (Embedder.BATCH_SIZE * 2 - i) for i in range(Embedder.BATCH_SIZE * 2)]
+        mock_model.embed.side_effect = lambda batch, **kwargs: iter([[float(len(t))] for t in batch])
+
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=1)
+        result = embedder.embed_batch(texts)
+
+        encoded = mock_model.embed.call_args.args[0]
+        assert encoded == sorted(texts, key=len)
+        np.testing.assert_array_equal(result[:, 0], [len(t) for t in texts])
 
     def test_embed_batch_empty_list(self, mock_embedder_setup):
         """Test embedding empty list of texts."""
@@ -74,43 +142,36 @@ class TestEmbedder:
 
         assert len(embedder.embed_batch([])) == 0
 
-    def test_add_embeddings_to_documents(self, mock_embedder_setup):
-        """Test the _add_embeddings_to_documents helper method."""
-        embedder = self._create_embedder(mock_embedder_setup)
-        documents = [{'content': 'text1'}, {'content': 'text2'}]
-        embeddings = np.array([[0.1, 0.2], [0.3, 0.4]])
-
-        embedder._add_embeddings_to_documents(documents, embeddings)
-
-        for i, doc in enumerate(documents):
-            np.testing.assert_array_equal(doc['embedding'], embeddings[i])
-
-    def test_embed_documents(self, mock_embedder_setup, capsys):
-        """Test embedding documents adds embeddings in-place."""
+    def test_embed_documents(self, mock_embedder_setup, caplog):
+        """Test embedding documents returns one contiguous float32 row per document."""
+        caplog.set_level(logging.INFO)
         _, mock_model = mock_embedder_setup
         embeddings_list = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
         mock_model.embed.return_value = iter(embeddings_list)
 
-        embedder = self._create_embedder(mock_embedder_setup)
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=3)
         documents = [
             {'content': 'text1', 'title': 'Doc 1'},
             {'content': 'text2', 'title': 'Doc 2'}
         ]
 
-        embedder.embed_documents(documents)
+        embeddings = embedder.embed_documents(documents)
 
-        for i, doc in enumerate(documents):
-            np.testing.assert_array_equal(doc['embedding'], np.array(embeddings_list[i]))
+        assert embeddings.dtype == np.float32
+        assert embeddings.flags['C_CONTIGUOUS']
+        np.testing.assert_array_almost_equal(embeddings, np.array(embeddings_list))
+        assert all('embedding' not in doc for doc in documents)
 
-        assert "Generating embeddings for 2 chunks" in capsys.readouterr().out
+        assert "Generating embeddings for 2 chunks" in caplog.text
 
-    def test_store(self, mock_embedder_setup, capsys):
+    def test_store(self, mock_embedder_setup, caplog):
         """Test embedding and storing documents."""
+        caplog.set_level(logging.INFO)
         _, mock_model = mock_embedder_setup
         embeddings_list = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
         mock_model.embed.return_value = iter(embeddings_list)
 
-        embedder = self._create_embedder(mock_embedder_setup)
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=3)
         documents = [
             {'content': 'text1', 'title': 'Doc 1'},
             {'content': 'text2', 'title': 'Doc 2'}
@@ -119,12 +180,12 @@ class TestEmbedder:
 
         embedder.store(documents, mock_vector_db)
 
-        for i, doc in enumerate(documents):
-            np.testing.assert_array_equal(doc['embedding'], np.array(embeddings_list[i]))
-
-        mock_vector_db.insert_documents.assert_called_once_with(documents)
+        mock_vector_db.insert_documents.assert_called_once()
+        stored_docs, stored_embeddings = mock_vector_db.insert_documents.call_args.args
+        assert stored_docs is documents
+        np.testing.assert_array_almost_equal(stored_embeddings, np.array(embeddings_list))
 
-        output = capsys.readouterr().out
+        output = caplog.text
         assert "Generating embeddings for 2 chunks" in output
         assert "Storing embeddings in Qdrant" in output
         assert "Successfully embedded and stored 2 chunks" in output
@@ -135,14 +196,14 @@ class TestEmbedder:
         embedding_list = [[0.1, 0.2, 0.3]]
         mock_model.embed.return_value = iter(embedding_list)
 
-        embedder = self._create_embedder(mock_embedder_setup)
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=3)
         documents = [{'content': 'test text'}]
         mock_vector_db = Mock()
 
         embedder.store(documents, mock_vector_db)
 
-        assert 'embedding' in documents[0]
-        np.testing.assert_array_equal(documents[0]['embedding'], np.array(embedding_list[0]))
+        _, stored_embeddings = mock_vector_db.insert_documents.call_args.args
+        assert stored_embeddings.shape == (1, 3)
         mock_vector_db.insert_documents.assert_called_once()
 
     def test_store_preserves_metadata(self, mock_embedder_setup):
@@ -150,7 +211,7 @@ class TestEmbedder:
         _, mock_model = mock_embedder_setup
         mock_model.embed.return_value = iter([[0.1, 0.2]])
 
-        embedder = self._create_embedder(mock_embedder_setup)
+        embedder = self._create_embedder(mock_embedder_setup, embedding_dim=2)
         expected_metadata = {
             'content': 'text',
             'title': 'Test',
@@ -166,7 +227,6 @@ class TestEmbedder:
         doc = documents[0]
         for key, value in expected_metadata.items():
             assert doc[key] == value
-        assert 'embedding' in doc
 
     def test_store_extracts_content_correctly(self, mock_embedder_setup):
         """Test that content is correctly extracted for batch embedding."""
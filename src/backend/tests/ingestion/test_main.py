@@ -1,11 +1,13 @@
 import pytest
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime, timezone
+import numpy as np
+from ingestion.embedder import Embedder
 from ingestion.main import IngestionPipeline
 
 
-def _create_mock_env(medium_username=None, github_username=None):
+def _create_mock_env(medium_username=None, github_username=None, resume_url=None):
     """Helper to create a mock os.getenv function."""
     def getenv_side_effect(key, default=None):
         env_vars = {}
@@ -13,6 +15,8 @@ def _create_mock_env(medium_username=None, github_username=None):
             env_vars['MEDIUM_USERNAME'] = medium_username
         if github_username:
             env_vars['GITHUB_USERNAME'] = github_username
+        if resume_url:
+            env_vars['RESUME_URL'] = resume_url
         return env_vars.get(key, default)
     return getenv_side_effect
 
@@ -20,6 +24,15 @@ def _create_mock_env(medium_username=None, github_username=None):
 class TestIngestionPipeline:
     """Test suite for IngestionPipeline class."""
 
+    @pytest.fixture
+    def pipeline_mocks(self):
+        """Patch the database, scraper lookup, embedder and environment a full run touches."""
+        with patch('ingestion.main.VectorDatabase') as mock_vector_db, \
+                patch('ingestion.source_registry.SourceRegistry.get_scraper_class') as mock_get_scraper_class, \
+                patch('ingestion.main.Embedder') as mock_embedder, \
+                patch('ingestion.main.os.getenv') as mock_getenv:
+            yield mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv
+
     def test_init_with_default_parameters(self):
         """Test pipeline initialization with default parameters."""
         pipeline = IngestionPipeline()
@@ -59,18 +72,15 @@ class TestIngestionPipeline:
 
         db_instance.close.assert_called_once()
 
-    @patch('ingestion.main.os.getenv')
-    @patch('ingestion.main.Embedder')
-    @patch('ingestion.source_registry.SourceRegistry.get_scraper_class')
-    @patch('ingestion.main.VectorDatabase')
-    def test_run_with_medium_source(self, mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv):
+    def test_run_with_medium_source(self, pipeline_mocks):
         """Test full pipeline execution with Medium source."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
         db_instance = Mock()
         db_instance.get_last_scraped_date.return_value = None
         mock_vector_db.return_value = db_instance
 
-        medium_instance = Mock()
-        medium_instance.scrape.return_value = [
+        medium_instance = Mock(scrape_async=AsyncMock())
+        medium_instance.scrape_async.return_value = [
             {'content': 'post1', 'title': 'Post 1'},
             {'content': 'post2', 'title': 'Post 2'}
         ]
@@ -86,8 +96,8 @@ class TestIngestionPipeline:
             pipeline.run()
 
         # Verify all major steps were executed
-        medium_instance.scrape.assert_called_once()
-        embedder_instance.store.assert_called_once()
+        medium_instance.scrape_async.assert_awaited_once()
+        db_instance.insert_documents.assert_called_once()
         db_instance.close.assert_called_once()
 
     @patch('ingestion.main.VectorDatabase')
@@ -104,18 +114,15 @@ class TestIngestionPipeline:
         assert "No documents found" in captured.out
         db_instance.close.assert_called_once()
 
-    @patch('ingestion.main.os.getenv')
-    @patch('ingestion.main.Embedder')
-    @patch('ingestion.source_registry.SourceRegistry.get_scraper_class')
-    @patch('ingestion.main.VectorDatabase')
-    def test_run_skips_embedding_when_no_documents(self, mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv):
+    def test_run_skips_embedding_when_no_documents(self, pipeline_mocks):
         """Test pipeline skips embedding when scraper returns no documents."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
         db_instance = Mock()
         db_instance.get_last_scraped_date.return_value = None
         mock_vector_db.return_value = db_instance
 
-        medium_instance = Mock()
-        medium_instance.scrape.return_value = []
+        medium_instance = Mock(scrape_async=AsyncMock())
+        medium_instance.scrape_async.return_value = []
         mock_get_scraper_class.return_value = Mock(return_value=medium_instance)
 
         mock_getenv.side_effect = _create_mock_env(medium_username='testuser')
@@ -127,19 +134,16 @@ class TestIngestionPipeline:
         mock_embedder.assert_not_called()
         db_instance.close.assert_called_once()
 
-    @patch('ingestion.main.os.getenv')
-    @patch('ingestion.main.Embedder')
-    @patch('ingestion.source_registry.SourceRegistry.get_scraper_class')
-    @patch('ingestion.main.VectorDatabase')
-    def test_run_uses_last_scraped_date(self, mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv):
+    def test_run_uses_last_scraped_date(self, pipeline_mocks):
         """Test pipeline passes last scraped date to scraper."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
         db_instance = Mock()
         last_scraped_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
         db_instance.get_last_scraped_date.return_value = last_scraped_date
         mock_vector_db.return_value = db_instance
 
-        medium_instance = Mock()
-        medium_instance.scrape.return_value = [{'content': 'new post'}]
+        medium_instance = Mock(scrape_async=AsyncMock())
+        medium_instance.scrape_async.return_value = [{'content': 'new post'}]
         mock_get_scraper_class.return_value = Mock(return_value=medium_instance)
 
         embedder_instance = Mock()
@@ -152,5 +156,278 @@ class TestIngestionPipeline:
             pipeline.run()
 
         # Verify scraper was called with the last scraped date
-        medium_instance.scrape.assert_called_once_with(last_scraped_date=last_scraped_date)
-        embedder_instance.store.assert_called_once()
+        medium_instance.scrape_async.assert_awaited_once_with(
+            last_scraped_date=last_scraped_date, etags=db_instance.get_etags.return_value
+        )
+        db_instance.insert_documents.assert_called_once()
+
+    def test_run_stores_each_source_as_it_finishes(self, pipeline_mocks):
+        """Test each source is embedded and stored separately with one shared embedder."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock())
+        scraper_instance.scrape_async.return_value = [{'content': 'post', 'title': 'Post'}]
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        mock_getenv.side_effect = _create_mock_env(medium_username='testuser', github_username='testuser')
+
+        with IngestionPipeline(sources=['medium', 'github']) as pipeline:
+            pipeline.run()
+
+        mock_embedder.assert_called_once()
+        db_instance.setup_database.assert_called_once_with(embedding_dim=384)
+        assert db_instance.insert_documents.call_count == 2
+
+    @patch('ingestion.main.Embedder')
+    def test_embed_and_store_splits_into_batches(self, mock_embedder):
+        """Test chunks are stored in batches of EMBED_BATCH_SIZE."""
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        pipeline = IngestionPipeline()
+        pipeline.vector_db = Mock()
+        chunked_docs = [{'content': f'chunk {i}'} for i in range(IngestionPipeline.EMBED_BATCH_SIZE + 1)]
+
+        pipeline._embed_and_store(chunked_docs)
+
+        batch_sizes = [len(call.args[0]) for call in pipeline.vector_db.insert_documents.call_args_list]
+        assert batch_sizes == [IngestionPipeline.EMBED_BATCH_SIZE, 1]
+
+    @patch('ingestion.main.Embedder')
+    def test_embed_and_store_accepts_lazy_chunks(self, mock_embedder):
+        """Test a chunk generator is embedded batch by batch without being materialized first."""
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        pipeline = IngestionPipeline()
+        pipeline.vector_db = Mock()
+        produced = []
+        produced_before_embed = []
+
+        def chunks():
+            for i in range(IngestionPipeline.EMBED_BATCH_SIZE + 1):
+                produced.append(i)
+                yield {'content': f'chunk {i}'}
+
+        def embed_documents(batch):
+            produced_before_embed.append(len(produced))
+            return [[0.0]] * len(batch)
+
+        embedder_instance.embed_documents.side_effect = embed_documents
+
+        pipeline._embed_and_store(chunks())
+
+        batch_sizes = [len(call.args[0]) for call in pipeline.vector_db.insert_documents.call_args_list]
+        assert batch_sizes == [IngestionPipeline.EMBED_BATCH_SIZE, 1]
+        # The first batch is embedded before the rest of the generator is consumed
+        assert produced_before_embed[0] == IngestionPipeline.EMBED_BATCH_SIZE
+
+    def test_embed_and_store_embeds_batches_in_process(self):
+        """Test ingestion batches stay below the embedder's multi-process threshold."""
+        Embedder.reset_cache()
+        with patch('ingestion.embedder.TextEmbedding') as mock_text_embedding, \
+                patch('ingestion.embedder.Embedder._resolve_embedding_dim', return_value=384):
+            mock_model = mock_text_embedding.return_value
+            mock_model.embed.side_effect = lambda texts, **kwargs: iter(np.zeros((len(texts), 384)))
+
+            pipeline = IngestionPipeline()
+            pipeline.vector_db = Mock()
+            pipeline._embed_and_store(
+                {'content': f'chunk {i}'} for i in range(IngestionPipeline.EMBED_BATCH_SIZE + 1)
+            )
+        Embedder.reset_cache()
+
+        parallel = [call.kwargs['parallel'] for call in mock_model.embed.call_args_list]
+        assert IngestionPipeline.EMBED_BATCH_SIZE < Embedder.PARALLEL_MIN_TEXTS
+        assert parallel == [None, None]
+
+    def test_scrape_state_is_read_on_main_thread(self, pipeline_mocks):
+        """Test stored scrape state is looked up before scrapers are dispatched to threads."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        import threading
+
+        main_thread = threading.current_thread()
+        lookup_threads = []
+
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.side_effect = (
+            lambda source: lookup_threads.append(threading.current_thread())
+        )
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock())
+        scraper_instance.scrape_async.return_value = []
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        mock_getenv.side_effect = _create_mock_env(medium_username='testuser', github_username='testuser')
+
+        with IngestionPipeline(sources=['medium', 'github']) as pipeline:
+            pipeline.run()
+
+        assert lookup_threads == [main_thread, main_thread]
+        assert scraper_instance.scrape_async.await_count == 2
+
+    def test_github_etags_are_loaded_and_saved(self, pipeline_mocks):
+        """Test GitHub ETags are passed to the scraper and stored after its documents."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        db_instance.get_etags.return_value = {'https://api.github.com/users/testuser': '"1"'}
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock())
+        scraper_instance.scrape_async.return_value = [{'content': 'repo', 'title': 'Repo'}]
+        scraper_instance.etags = {'https://api.github.com/users/testuser': '"2"'}
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        mock_getenv.side_effect = _create_mock_env(github_username='testuser')
+
+        with IngestionPipeline(sources=['github']) as pipeline:
+            pipeline.run()
+
+        scraper_instance.scrape_async.assert_awaited_once_with(
+            last_scraped_date=None, etags=db_instance.get_etags.return_value
+        )
+        db_instance.set_etags.assert_called_once_with('github', scraper_instance.etags)
+        db_instance.insert_documents.assert_called_once()
+
+    def test_resume_etags_are_loaded_and_saved(self, pipeline_mocks):
+        """Test the resume's stored hash and ETag are passed to its scraper, and its new ETag is saved."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        db_instance.get_content_hash.return_value = 'abc'
+        db_instance.get_etags.return_value = {'https://example.com/resume.pdf': '"1"'}
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock(return_value=[]))
+        scraper_instance.etags = {'https://example.com/resume.pdf': '"2"'}
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        mock_getenv.side_effect = _create_mock_env(resume_url='https://example.com/resume.pdf')
+
+        with IngestionPipeline(sources=['resume']) as pipeline:
+            pipeline.run()
+
+        db_instance.get_etags.assert_called_once_with('resume')
+        scraper_instance.scrape_async.assert_awaited_once_with(
+            last_scraped_date=None, stored_hash='abc', etags=db_instance.get_etags.return_value
+        )
+        db_instance.set_etags.assert_called_once_with('resume', scraper_instance.etags)
+
+    def test_run_writes_to_qdrant_in_order_on_writer_thread(self, pipeline_mocks):
+        """Test Qdrant writes run off the main thread, in the order they were submitted."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        import threading
+
+        main_thread = threading.current_thread()
+        writes = []
+
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        db_instance.setup_database.side_effect = lambda **kwargs: writes.append(('setup', threading.current_thread()))
+        db_instance.insert_documents.side_effect = lambda *args: writes.append(('insert', threading.current_thread()))
+        db_instance.set_etags.side_effect = lambda *args: writes.append(('etags', threading.current_thread()))
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock())
+        scraper_instance.scrape_async.return_value = [{'content': 'repo', 'title': 'Repo'}]
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        mock_getenv.side_effect = _create_mock_env(github_username='testuser')
+
+        with IngestionPipeline(sources=['github']) as pipeline:
+            pipeline.run()
+
+        assert [name for name, _ in writes] == ['setup', 'insert', 'etags']
+        assert all(thread is not main_thread for _, thread in writes)
+
+    def test_run_reraises_write_failures(self, pipeline_mocks):
+        """Test a failed Qdrant write surfaces from run() and skips saving scrape state."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        db_instance.insert_documents.side_effect = RuntimeError("Qdrant unavailable")
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock())
+        scraper_instance.scrape_async.return_value = [{'content': 'repo', 'title': 'Repo'}]
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        embedder_instance = Mock()
+        embedder_instance.embedding_dim = 384
+        mock_embedder.return_value = embedder_instance
+
+        mock_getenv.side_effect = _create_mock_env(github_username='testuser')
+
+        with pytest.raises(RuntimeError, match="Qdrant unavailable"):
+            with IngestionPipeline(sources=['github']) as pipeline:
+                pipeline.run()
+
+        db_instance.set_etags.assert_not_called()
+
+    def test_scraper_instances_are_reused_across_runs(self, pipeline_mocks):
+        """Test each source's scraper is created once per pipeline, not once per run."""
+        mock_vector_db, mock_get_scraper_class, mock_embedder, mock_getenv = pipeline_mocks
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        mock_vector_db.return_value = db_instance
+
+        scraper_class = Mock(return_value=Mock(scrape_async=AsyncMock(return_value=[])))
+        mock_get_scraper_class.return_value = scraper_class
+
+        mock_getenv.side_effect = _create_mock_env(medium_username='testuser')
+
+        with IngestionPipeline(sources=['medium']) as pipeline:
+            pipeline.run()
+            pipeline.run()
+
+        scraper_class.assert_called_once()
+        assert scraper_class.return_value.scrape_async.await_count == 2
+
+    @patch('ingestion.main.os.getenv')
+    @patch('ingestion.source_registry.SourceRegistry.get_scraper_class')
+    @patch('ingestion.main.VectorDatabase')
+    def test_run_reraises_scraper_failures(self, mock_vector_db, mock_get_scraper_class, mock_getenv):
+        """Test an exception raised while scraping surfaces from run()."""
+        db_instance = Mock()
+        db_instance.get_last_scraped_date.return_value = None
+        mock_vector_db.return_value = db_instance
+
+        scraper_instance = Mock(scrape_async=AsyncMock(side_effect=RuntimeError("feed unavailable")))
+        mock_get_scraper_class.return_value = Mock(return_value=scraper_instance)
+
+        mock_getenv.side_effect = _create_mock_env(medium_username='testuser')
+
+        with pytest.raises(RuntimeError, match="feed unavailable"):
+            with IngestionPipeline(sources=['medium']) as pipeline:
+                pipeline.run()
+
+    @patch('ingestion.main.os.getenv')
+    def test_active_sources_are_resolved_once_at_init(self, mock_getenv):
+        """Test configured sources are looked up in the environment when the pipeline is created."""
+        mock_getenv.side_effect = _create_mock_env(github_username='testuser', medium_username='testuser')
+
+        pipeline = IngestionPipeline(sources=['github', 'medium', 'resume'])
+        lookups = mock_getenv.call_count
+
+        assert pipeline._active_sources == ['medium', 'github']
+        assert pipeline._active_sources_label == 'github, medium'
+        assert lookups == 3
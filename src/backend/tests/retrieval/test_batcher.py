@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from retrieval.batcher import QueryBatcher
+
+
+@pytest.fixture
+def query_engine():
+    """Mock query engine that echoes queries back as results."""
+    engine = AsyncMock()
+    engine.asearch.side_effect = lambda query, top_k: [{"query": query, "top_k": top_k}]
+    engine.asearch_batch.side_effect = lambda queries, top_ks: [
+        [{"query": query, "top_k": top_k}] for query, top_k in zip(queries, top_ks)
+    ]
+    return engine
+
+
+def test_single_query_uses_search(query_engine):
+    """Test that a lone query skips the batch API."""
+    batcher = QueryBatcher(query_engine)
+
+    result = asyncio.run(batcher.search("Who is Jason?", top_k=3))
+
+    assert result == [{"query": "Who is Jason?", "top_k": 3}]
+    query_engine.asearch.assert_called_once_with("Who is Jason?", top_k=3)
+    query_engine.asearch_batch.assert_not_called()
+
+
+def test_concurrent_queries_are_batched(query_engine):
+    """Test that queries arriving together are resolved by one batched search."""
+    batcher = QueryBatcher(query_engine, max_wait_seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.search("first", top_k=1),
+            batcher.search("second", top_k=2),
+            batcher.search("third", top_k=3),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [
+        [{"query": "first", "top_k": 1}],
+        [{"query": "second", "top_k": 2}],
+        [{"query": "third", "top_k": 3}],
+    ]
+    query_engine.asearch_batch.assert_called_once_with(["first", "second", "third"], [1, 2, 3])
+
+
+def test_batch_respects_max_batch_size(query_engine):
+    """Test that batches are split once max_batch_size is reached."""
+    batcher = QueryBatcher(query_engine, max_batch_size=2, max_wait_seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(*(batcher.search(f"q{i}") for i in range(4)))
+
+    results = asyncio.run(run())
+
+    assert len(results) == 4
+    assert query_engine.asearch_batch.call_count == 2
+
+
+def test_full_batch_is_dispatched_without_waiting(query_engine):
+    """Test a batch is sent as soon as it is full rather than at the end of the wait."""
+    batcher = QueryBatcher(query_engine, max_batch_size=2, max_wait_seconds=10)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.search("first"), batcher.search("second")), timeout=1
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [[{"query": "first", "top_k": 5}], [{"query": "second", "top_k": 5}]]
+    query_engine.asearch_batch.assert_called_once_with(["first", "second"], [5, 5])
+
+
+def test_search_error_propagates_to_callers(query_engine):
+    """Test that a failing search raises in every waiting caller."""
+    query_engine.asearch.side_effect = Exception("Database error")
+    batcher = QueryBatcher(query_engine)
+
+    with pytest.raises(Exception, match="Database error"):
+        asyncio.run(batcher.search("Who is Jason?"))
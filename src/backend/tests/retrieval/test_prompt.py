@@ -1,8 +1,20 @@
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from retrieval.prompt import PromptBuilder
 
 
+def _completion(content):
+    """Build a chat completion shaped like the OpenAI SDK's response."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _stream_chunk(content):
+    """Build a streamed chat completion chunk shaped like the OpenAI SDK's."""
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
 @pytest.fixture
 def prompt_builder():
     """Create a PromptBuilder instance with a mock API key."""
@@ -100,12 +112,60 @@ def test_build_context_formatting(prompt_builder):
     assert any("[Source 2] Doc2 (source2.txt)" in line for line in lines)
 
 
+def test_build_context_orders_documents_by_id(prompt_builder):
+    """Test that the same documents render the same context regardless of rank."""
+    documents = [
+        {"id": "b", "title": "Doc B", "source": "b.txt", "content": "Content B"},
+        {"id": "a", "title": "Doc A", "source": "a.txt", "content": "Content A"},
+    ]
+
+    context = prompt_builder.build_context(documents)
+
+    assert context == prompt_builder.build_context(list(reversed(documents)))
+    assert context.index("Doc A") < context.index("Doc B")
+
+
+def test_build_context_reuses_cached_context(prompt_builder):
+    """Test that contexts are cached by document ids."""
+    documents = [{"id": "a", "title": "Doc A", "source": "a.txt", "content": "Content A"}]
+
+    first = prompt_builder.build_context(documents)
+    second = prompt_builder.build_context([dict(documents[0])])
+
+    assert first is second
+    assert len(prompt_builder._context_cache) == 1
+
+
+def test_build_context_cache_distinguishes_changed_content(prompt_builder):
+    """Test a re-ingested document keeping its id is not served from its old rendering."""
+    original = {"id": "a", "title": "Doc A", "source": "a.txt", "content": "Old content"}
+    updated = {**original, "content": "New content"}
+
+    first = prompt_builder.build_context([original])
+    second = prompt_builder.build_context([updated])
+
+    assert "Old content" in first
+    assert "New content" in second and "Old content" not in second
+
+
+@patch("retrieval.prompt.OpenAI")
+def test_generate_answer_passes_prompt_cache_key(mock_openai_class, prompt_builder):
+    """Test that identical contexts share a prompt cache key."""
+    mock_client = MagicMock()
+    prompt_builder.client = mock_client
+
+    prompt_builder.generate_answer("First question?", "Shared context")
+    prompt_builder.generate_answer("Second question?", "Shared context")
+
+    first_call, second_call = mock_client.chat.completions.create.call_args_list
+    assert first_call.kwargs["prompt_cache_key"] == second_call.kwargs["prompt_cache_key"]
+
+
 @patch("retrieval.prompt.OpenAI")
 def test_generate_answer(mock_openai_class, prompt_builder):
     """Test answer generation with mocked OpenAI API."""
     # Mock the API response
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = "This is the generated answer."
+    mock_response = _completion("This is the generated answer.")
 
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = mock_response
@@ -133,8 +193,7 @@ def test_generate_answer(mock_openai_class, prompt_builder):
 @patch("retrieval.prompt.OpenAI")
 def test_generate_answer_prompt_structure(mock_openai_class, prompt_builder):
     """Test that the prompt includes all required elements."""
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = "Answer"
+    mock_response = _completion("Answer")
 
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = mock_response
@@ -158,8 +217,7 @@ def test_generate_answer_prompt_structure(mock_openai_class, prompt_builder):
 def test_answer_question(mock_openai_class, prompt_builder, sample_documents):
     """Test the complete answer_question workflow."""
     # Mock the API response
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = "Jason is a software engineer."
+    mock_response = _completion("Jason is a software engineer.")
 
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = mock_response
@@ -177,18 +235,30 @@ def test_answer_question(mock_openai_class, prompt_builder, sample_documents):
 
 @patch("retrieval.prompt.OpenAI")
 def test_answer_question_empty_documents(mock_openai_class, prompt_builder):
-    """Test answer_question with no documents."""
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = "I do not know him well enough to answer."
-
+    """Test answer_question with no documents answers without calling the LLM."""
     mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = mock_response
     prompt_builder.client = mock_client
 
     result = prompt_builder.answer_question("Who is Jason?", [])
 
-    assert result["answer"] == "I do not know him well enough to answer."
+    assert result["answer"] == PromptBuilder.NO_CONTEXT_ANSWER
     assert result["sources"] == []
+    mock_client.chat.completions.create.assert_not_called()
+
+
+def test_agenerate_answer_stream_without_context_skips_llm(prompt_builder):
+    """Test async streaming with an empty context yields the canned answer without calling the LLM."""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    prompt_builder.aclient = MagicMock()
+    prompt_builder.aclient.chat.completions.create = AsyncMock()
+
+    async def collect():
+        return [chunk async for chunk in prompt_builder.agenerate_answer_stream("Q?", "")]
+
+    assert asyncio.run(collect()) == [PromptBuilder.NO_CONTEXT_ANSWER]
+    prompt_builder.aclient.chat.completions.create.assert_not_awaited()
 
 
 @patch("retrieval.prompt.OpenAI")
@@ -200,3 +270,90 @@ def test_answer_question_api_error(mock_openai_class, prompt_builder, sample_doc
 
     with pytest.raises(Exception, match="API Error"):
         prompt_builder.answer_question("Test question", sample_documents)
+
+
+def test_agenerate_answer_stream_yields_chunks(prompt_builder):
+    """Test async streaming yields non-empty content chunks."""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    async def fake_stream():
+        for content in ["Jason", None, " codes"]:
+            yield _stream_chunk(content)
+
+    prompt_builder.aclient = MagicMock()
+    prompt_builder.aclient.chat.completions.create = AsyncMock(return_value=fake_stream())
+
+    async def collect():
+        return [chunk async for chunk in prompt_builder.agenerate_answer_stream("Q?", "ctx")]
+
+    assert asyncio.run(collect()) == ["Jason", " codes"]
+    call_args = prompt_builder.aclient.chat.completions.create.call_args
+    assert call_args.kwargs["stream"] is True
+
+
+def test_aanswer_question_awaits_async_client(prompt_builder, sample_documents):
+    """Test async answer_question generates the answer through the async client."""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    mock_response = _completion("Jason is a software engineer.")
+    prompt_builder.client = MagicMock()
+    prompt_builder.aclient = MagicMock()
+    prompt_builder.aclient.chat.completions.create = AsyncMock(return_value=mock_response)
+
+    result = asyncio.run(prompt_builder.aanswer_question("What does Jason do?", sample_documents))
+
+    assert result == {"answer": "Jason is a software engineer.", "sources": sample_documents}
+    call_args = prompt_builder.aclient.chat.completions.create.call_args
+    assert call_args.kwargs["prompt_cache_key"] == prompt_builder._prompt_cache_key(
+        prompt_builder.build_context(sample_documents)
+    )
+    assert "What does Jason do?" in call_args.kwargs["messages"][1]["content"]
+    prompt_builder.client.chat.completions.create.assert_not_called()
+
+
+def test_async_client_uses_http2(prompt_builder):
+    """Test concurrent completions share a multiplexed HTTP/2 connection pool."""
+    assert prompt_builder.aclient._client._transport._pool._http2 is True
+
+
+def test_build_context_truncates_to_word_budget():
+    """Test the most relevant documents are kept within the budget and the boundary one is cut short."""
+    builder = PromptBuilder(openai_api_key="test-key", max_context_words=5)
+    documents = [
+        {"id": "b", "title": "B", "source": "medium", "content": "one two three"},
+        {"id": "a", "title": "A", "source": "medium", "content": "four five six"},
+        {"id": "c", "title": "C", "source": "medium", "content": "seven"},
+    ]
+
+    context = builder.build_context(documents)
+
+    assert context == (
+        "[Source 1] A (medium)\nfour five\n"
+        "\n"
+        "[Source 2] B (medium)\none two three\n"
+    )
+
+
+def test_build_context_cache_distinguishes_truncation():
+    """Test a truncated document is not served from the cache entry of its full rendering."""
+    builder = PromptBuilder(openai_api_key="test-key", max_context_words=3)
+    short = {"id": "a", "title": "A", "source": "medium", "content": "one two"}
+    long = {"id": "b", "title": "B", "source": "medium", "content": "three four"}
+
+    full = builder.build_context([long])
+    truncated = builder.build_context([short, long])
+
+    assert "three four" in full
+    assert "three\n" in truncated and "three four" not in truncated
+
+
+def test_build_messages_reuses_system_message(prompt_builder):
+    """Test every request shares the same prebuilt system message."""
+    first = prompt_builder._build_messages("Q1", "context one")
+    second = prompt_builder._build_messages("Q2", "context two")
+
+    assert first[0] is second[0] is PromptBuilder.SYSTEM_MESSAGE
+    assert first[1]["role"] == "user"
+    assert "context one" in first[1]["content"] and "Q1" in first[1]["content"]
@@ -0,0 +1,88 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from retrieval.query import QueryEngine
+
+
+@pytest.fixture
+def query_engine():
+    """Create a QueryEngine with mocked embedder and vector database."""
+    embedder = Mock()
+    embedder.embed_batch.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
+    vector_db = Mock()
+    vector_db.search_similar_batch.return_value = [[], []]
+    vector_db.asearch_similar_batch = AsyncMock(return_value=[[], []])
+    return QueryEngine(embedder, vector_db)
+
+
+def test_search_batch_embeds_once_and_searches_once(query_engine):
+    """Test that a batch of questions is embedded and searched in one call each."""
+    results = query_engine.search_batch(["first?", "second?"], top_ks=[3, 4])
+
+    assert results == [[], []]
+    query_engine.embedder.embed_batch.assert_called_once_with(["first?", "second?"])
+    assert query_engine.vector_db.search_similar_batch.call_args.kwargs["top_ks"] == [3, 4]
+
+
+def test_search_batch_broadcasts_shared_top_k(query_engine):
+    """Test that a single top_k applies to every question."""
+    query_engine.search_batch(["first?", "second?"], top_ks=5)
+
+    assert query_engine.vector_db.search_similar_batch.call_args.kwargs["top_ks"] == [5, 5]
+
+
+def test_asearch_batch_broadcasts_shared_top_k(query_engine):
+    """Test that the async batch search also accepts a shared top_k."""
+    asyncio.run(query_engine.asearch_batch(["first?", "second?"], top_ks=5))
+
+    query_engine.vector_db.asearch_similar_batch.assert_awaited_once()
+    assert query_engine.vector_db.asearch_similar_batch.call_args.kwargs["top_ks"] == [5, 5]
+
+
+def test_embed_query_reuses_embedding_of_equivalent_query(query_engine):
+    """Test case and whitespace variants of a query are embedded once."""
+    query_engine.embedder.embed_text.return_value = np.array([0.5, 0.6])
+
+    first = query_engine.embed_query("Who is Jason?")
+    second = query_engine.embed_query("  who is   JASON? ")
+
+    np.testing.assert_array_equal(first, second)
+    query_engine.embedder.embed_text.assert_called_once_with("Who is Jason?")
+
+
+def test_embed_queries_only_embeds_uncached_queries(query_engine):
+    """Test a batch embeds just the queries missing from the cache, keeping order."""
+    query_engine.embedder.embed_text.return_value = np.array([0.5, 0.6])
+    query_engine.embed_query("cached?")
+
+    embeddings = query_engine.embed_queries(["first?", "cached?", "second?"])
+
+    query_engine.embedder.embed_batch.assert_called_once_with(["first?", "second?"])
+    np.testing.assert_array_equal(embeddings, [[0.1, 0.2], [0.5, 0.6], [0.3, 0.4]])
+
+
+def test_aembed_query_skips_worker_thread_on_cache_hit(query_engine, monkeypatch):
+    """Test a cached embedding is returned without handing off to a thread."""
+    query_engine.embedder.embed_text.return_value = np.array([0.5, 0.6])
+    query_engine.embed_query("Who is Jason?")
+    to_thread = AsyncMock()
+    monkeypatch.setattr("retrieval.query.asyncio.to_thread", to_thread)
+
+    embedding = asyncio.run(query_engine.aembed_query("who is jason?"))
+
+    np.testing.assert_array_equal(embedding, [0.5, 0.6])
+    to_thread.assert_not_awaited()
+
+
+def test_embedding_cache_is_bounded(query_engine, monkeypatch):
+    """Test the least recently used embedding is evicted once the cache is full."""
+    monkeypatch.setattr(QueryEngine, "EMBEDDING_CACHE_SIZE", 2)
+    query_engine.embedder.embed_text.return_value = np.array([0.5, 0.6])
+
+    for query in ("one", "two", "three"):
+        query_engine.embed_query(query)
+    query_engine.embed_query("one")
+
+    assert query_engine.embedder.embed_text.call_count == 4
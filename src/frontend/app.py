@@ -1,5 +1,4 @@
-import json
-
+import orjson
 import requests
 import streamlit as st
 from requests.adapters import HTTPAdapter
@@ -9,6 +8,18 @@ from urllib3.util.retry import Retry
 BACKEND_API_URL = "http://api:80"
 
 
+def format_sources(sources) -> str:
+    """Render every source as one Markdown block, so the expander holds a single element."""
+    return "\n\n".join(
+        f"**{i}. {source['title']}** ({source['source']})\n\n"
+        f"*Similarity: {source['similarity']:.2%}*\n\n"
+        f"[Link]({source['url']})\n\n"
+        f"```\n{source['content'][:200]}...\n```\n\n"
+        "---"
+        for i, source in enumerate(sources, 1)
+    )
+
+
 @st.cache_resource
 def get_http_session() -> requests.Session:
     session = requests.Session()
@@ -34,13 +45,12 @@ for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
         if message["role"] == "assistant" and "sources" in message:
+            sources_markdown = message.get("sources_markdown")
+            if sources_markdown is None:
+                # Messages kept in session state from before sources were preformatted
+                sources_markdown = message["sources_markdown"] = format_sources(message["sources"])
             with st.expander("📚 View Sources"):
-                for i, source in enumerate(message["sources"], 1):
-                    st.markdown(f"**{i}. {source['title']}** ({source['source']})")
-                    st.markdown(f"*Similarity: {source['similarity']:.2%}*")
-                    st.markdown(f"[Link]({source['url']})")
-                    st.markdown(f"```\n{source['content'][:200]}...\n```")
-                    st.markdown("---")
+                st.markdown(sources_markdown)
 
 SUGGESTED_QUESTIONS = [
     "Who is Jason Hee?",
@@ -72,6 +82,7 @@ if question:
             response = get_http_session().post(
                 f"{BACKEND_API_URL}/query/stream",
                 json={"question": question, "top_k": 5},
+                headers={"Accept": "text/event-stream"},
                 stream=True
             )
             response.raise_for_status()
@@ -82,29 +93,29 @@ if question:
                 for raw_line in response.iter_lines():
                     if not raw_line or not raw_line.startswith(b"data: "):
                         continue
-                    event = json.loads(raw_line[6:])
+                    event = orjson.loads(raw_line[6:])
                     if event["type"] == "sources":
                         captured["sources"] = event["sources"]
                     elif event["type"] == "text":
                         yield event["content"]
+                    elif event["type"] == "error":
+                        raise requests.exceptions.RequestException(event["detail"])
 
             full_answer = st.write_stream(stream_text())
             sources = captured["sources"] or []
+            # Formatted once here and reused by every rerun that redraws the history
+            sources_markdown = format_sources(sources)
 
             # Display sources
             with st.expander("📚 View Sources"):
-                for i, source in enumerate(sources, 1):
-                    st.markdown(f"**{i}. {source['title']}** ({source['source']})")
-                    st.markdown(f"*Similarity: {source['similarity']:.2%}*")
-                    st.markdown(f"[Link]({source['url']})")
-                    st.markdown(f"```\n{source['content'][:200]}...\n```")
-                    st.markdown("---")
+                st.markdown(sources_markdown)
 
             # Add assistant message
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": full_answer,
-                "sources": sources
+                "sources": sources,
+                "sources_markdown": sources_markdown
             })
 
         except requests.exceptions.RequestException as e: